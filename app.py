@@ -16,6 +16,17 @@ from connection_pool import ConnectionPool
 from error_recovery import ErrorRecoveryManager
 from safe_logger import get_safe_logger, is_logging_enabled
 
+_IS_WINDOWS = platform.system() == 'Windows'
+
+# Use uvloop's event loop when available (not supported on Windows).
+# Installed at import so it is in place before asyncio.run() in the entry point.
+if not _IS_WINDOWS:
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
+
 class PyLiRPApplication:
     """Main application class integrating all components"""
     
@@ -53,7 +64,7 @@ class PyLiRPApplication:
         """Initialize all application components"""
         try:
             # Windows-specific initialization
-            if platform.system() == 'Windows':
+            if _IS_WINDOWS:
                 await self._init_windows_support()
             
             # Load configuration
@@ -63,11 +74,23 @@ class PyLiRPApplication:
             # Setup logging based on configuration
             self._setup_logging()
             
-            # Initialize components
-            await self._init_security()
-            await self._init_monitoring()
-            await self._init_connection_pool()
-            await self._init_error_recovery()
+            # Initialize components. Security, monitoring, connection pool and
+            # error recovery only read self.config and don't depend on each
+            # other, so they start concurrently; the PPP bridge comes last.
+            # If one fails the others are cancelled rather than left running.
+            init_tasks = [asyncio.ensure_future(coro) for coro in (
+                self._init_security(),
+                self._init_monitoring(),
+                self._init_connection_pool(),
+                self._init_error_recovery()
+            )]
+            try:
+                await asyncio.gather(*init_tasks)
+            except BaseException:
+                for task in init_tasks:
+                    task.cancel()
+                await asyncio.gather(*init_tasks, return_exceptions=True)
+                raise
             await self._init_ppp_bridge()
             
             # Integrate components
@@ -325,17 +348,19 @@ class PyLiRPApplication:
         """Setup signal handlers for graceful shutdown"""
         import signal
         
+        windows_manager = None
+        if _IS_WINDOWS:
+            from windows_support import get_windows_manager
+            windows_manager = get_windows_manager()
+        
         def signal_handler(signum, frame):
             self._log_or_print("info", f"Received signal {signum}, initiating shutdown...")
-            if platform.system() == 'Windows':
-                from windows_support import get_windows_manager
-                windows_manager = get_windows_manager()
-                if windows_manager:
-                    windows_manager.log_event('info', f'Received shutdown signal {signum}')
+            if windows_manager:
+                windows_manager.log_event('info', f'Received shutdown signal {signum}')
             self.shutdown_event.set()
         
         # Windows doesn't support SIGTERM, use different signals
-        if platform.system() == 'Windows':
+        if _IS_WINDOWS:
             signal.signal(signal.SIGINT, signal_handler)
             signal.signal(signal.SIGBREAK, signal_handler)
         else:
@@ -17,8 +17,59 @@ from typing import Optional, Tuple, Dict, Any
 from dataclasses import dataclass
 from enum import Enum
 
+from packet_utils import ones_complement_sum
+
 logger = logging.getLogger(__name__)
 
+# PPP address/control/protocol header for IPv4 frames (0xFF, 0x03, 0x0021)
+_PPP_IP_HEADER = b'\xff\x03\x00\x21'
+
+# HDLC-like framing (RFC 1662): flag and escape bytes, escaped as 0x7D, byte ^ 0x20
+_PPP_FLAG_BYTE = 0x7E
+_PPP_ESCAPE_BYTE = 0x7D
+_PPP_FLAG = b'\x7e'
+_PPP_ESCAPE = b'\x7d'
+_PPP_ESCAPED_FLAG = b'\x7d\x5e'
+_PPP_ESCAPED_ESCAPE = b'\x7d\x5d'
+
+# TCP flags
+_FLAG_FIN = 0x01
+_FLAG_PSH = 0x08
+_FLAG_ACK = 0x10
+_FLAGS_PSH_ACK = 0x18
+
+# Delayed ACK (RFC 1122 4.2.3.2): in-order data is ACKed after this delay,
+# or immediately once a second segment arrives, PSH is set, or FIN is seen
+_DELAYED_ACK_TIMEOUT = 0.04
+
+# Offsets into the 40-byte IPv4 + TCP header template
+_IP_LEN_OFFSET = 2        # total length, identification
+_IP_CSUM_OFFSET = 10
+_TCP_SEQ_OFFSET = 24      # sequence number, acknowledgment number
+_TCP_CSUM_OFFSET = 36
+
+_U16 = struct.Struct('!H')
+_LEN_ID = struct.Struct('!HH')
+_SEQ_ACK = struct.Struct('!II')
+
+# Default bound on queued PPP -> Service segments per connection
+# (64 x 1460 byte MSS ~= 90KB); see TCPConfig.max_per_conn_buffer
+_PPP_QUEUE_MAXSIZE = 64
+
+# Service -> PPP receive buffer size; one buffer is reused per connection
+_SERVICE_READ_SIZE = 4096
+
+# Fallback PPP port -> service port mapping when no config is supplied
+_DEFAULT_PORT_MAPPING = {
+    22: 22,    # SSH
+    80: 80,    # HTTP
+    443: 443,  # HTTPS
+}
+
+# Serial writes are only drained once this much data is buffered in the
+# transport, so bursts of small segments share a single drain() round-trip
+_SERIAL_WRITE_HIGH_WATER = 32 * 1024
+
 class TCPState(Enum):
     CLOSED = "CLOSED"
     ESTABLISHED = "ESTABLISHED"
@@ -28,8 +79,8 @@ class TCPState(Enum):
 class TCPConnection:
     """Enhanced TCP connection for bidirectional forwarding"""
     state: TCPState = TCPState.CLOSED
-    local_reader: Optional[asyncio.StreamReader] = None
-    local_writer: Optional[asyncio.StreamWriter] = None
+    local_transport: Optional[asyncio.Transport] = None
+    local_protocol: Optional['_ServiceProtocol'] = None
     
     # TCP sequence tracking
     seq_num: int = 0
@@ -45,11 +96,129 @@ class TCPConnection:
     # Bidirectional proxy task
     proxy_task: Optional[asyncio.Task] = None
     
-    # Shutdown coordination
+    # PPP -> Service data, created when forwarding starts
+    _ppp_data_queue: Optional[asyncio.Queue] = None
+    
+    # Reusable IP+TCP header for service -> PPP segments (see _send_data_to_ppp)
+    _tcp_ip_template: Optional[bytearray] = None
+    _tcp_csum_base: int = 0
+    
+    # Delayed ACK state
+    _ack_pending: int = 0
+    _ack_timer: Optional[asyncio.TimerHandle] = None
+    
+    # Shutdown coordination (created lazily, see _get_shutdown_event)
     _shutdown_event: Optional[asyncio.Event] = None
+
+# Connections are keyed by (src_ip, src_port, dst_ip, dst_port)
+ConnectionKey = Tuple[str, int, str, int]
+
+def _connection_key(conn: TCPConnection) -> ConnectionKey:
+    """4-tuple identifying a connection in the connection tables"""
+    return (conn.src_ip, conn.src_port, conn.dst_ip, conn.dst_port)
+
+def _is_shutdown(conn: TCPConnection) -> bool:
+    """Check shutdown without allocating the event"""
+    event = conn._shutdown_event
+    return event is not None and event.is_set()
+
+def _get_shutdown_event(conn: TCPConnection) -> asyncio.Event:
+    """Return the connection's shutdown event, creating it on first use"""
+    if conn._shutdown_event is None:
+        conn._shutdown_event = asyncio.Event()
+    return conn._shutdown_event
+
+def _signal_shutdown(conn: TCPConnection):
+    """Set the shutdown event and wake the PPP -> Service forwarder"""
+    _get_shutdown_event(conn).set()
+    if conn._ppp_data_queue is not None:
+        try:
+            conn._ppp_data_queue.put_nowait(None)  # Sentinel unblocks queue.get()
+        except asyncio.QueueFull:
+            pass  # get() won't block; the loop sees the event on its next check
+
+class _ServiceProtocol(asyncio.BufferedProtocol):
+    """
+    Service-side protocol used instead of StreamReader/StreamWriter
+    
+    Incoming data is received straight into a pre-allocated buffer
+    (readinto semantics) and copied out once per read(); writes go directly
+    to the transport with drain() driven by pause/resume_writing.
+    """
+    
+    def __init__(self):
+        self.transport: Optional[asyncio.Transport] = None
+        self._buf = bytearray(_SERVICE_READ_SIZE)
+        self._view = memoryview(self._buf)
+        self._filled = 0      # Bytes received into _buf
+        self._reading_paused = False
+        self._eof = False
+        self._data_event = asyncio.Event()
+        self._drain_waiter: Optional[asyncio.Future] = None
+        self._exc: Optional[Exception] = None
+    
+    def connection_made(self, transport):
+        self.transport = transport
+    
+    def get_buffer(self, sizehint: int) -> memoryview:
+        return self._view[self._filled:]
+    
+    def buffer_updated(self, nbytes: int):
+        self._filled += nbytes
+        if self._filled == len(self._buf):
+            self.transport.pause_reading()
+            self._reading_paused = True
+        self._data_event.set()
+    
+    def eof_received(self) -> bool:
+        self._eof = True
+        self._data_event.set()
+        # Keep the transport open for writing, as StreamReaderProtocol does:
+        # the PPP side may still send after the service's FIN, and
+        # _cleanup_connection() closes the transport once the handler is done
+        return True
+    
+    def connection_lost(self, exc: Optional[Exception]):
+        self._eof = True
+        self._exc = exc
+        self._data_event.set()
+        self._wake_drain_waiter()
     
-    def __post_init__(self):
-        self._shutdown_event = asyncio.Event()
+    def pause_writing(self):
+        self._drain_waiter = asyncio.get_running_loop().create_future()
+    
+    def resume_writing(self):
+        self._wake_drain_waiter()
+    
+    def _wake_drain_waiter(self):
+        waiter, self._drain_waiter = self._drain_waiter, None
+        if waiter is not None and not waiter.done():
+            waiter.set_result(None)
+    
+    async def drain(self):
+        """Wait until the transport's write buffer is below its high-water mark"""
+        if self.transport.is_closing():
+            raise self._exc or ConnectionResetError("Service connection lost")
+        if self._drain_waiter is not None:
+            await self._drain_waiter
+    
+    async def read(self) -> bytes:
+        """
+        Return received data (empty at EOF)
+        
+        This is the only copy on the service -> PPP path: the result may be
+        held by the serial transport, so it can't alias the receive buffer.
+        """
+        while not self._filled and not self._eof:
+            self._data_event.clear()
+            await self._data_event.wait()
+        
+        data = bytes(self._view[:self._filled])
+        self._filled = 0
+        if self._reading_paused:
+            self._reading_paused = False
+            self.transport.resume_reading()
+        return data
 
 class ProductionBidirectionalProxy:
     """
@@ -59,10 +228,12 @@ class ProductionBidirectionalProxy:
     - nginx-python, haproxy-async, trojan-go, shadowsocks-python, etc.
     """
     
-    def __init__(self, tcp_stack, serial_writer: asyncio.StreamWriter):
+    def __init__(self, tcp_stack, serial_writer: asyncio.StreamWriter,
+                 queue_maxsize: int = _PPP_QUEUE_MAXSIZE):
         self.tcp_stack = tcp_stack
         self.serial_writer = serial_writer
-        self.active_connections: Dict[str, TCPConnection] = {}
+        self.queue_maxsize = queue_maxsize
+        self.active_connections: Dict[ConnectionKey, TCPConnection] = {}
     
     async def establish_bidirectional_forwarding(self, conn: TCPConnection, 
                                                host: str, port: int) -> bool:
@@ -75,8 +246,9 @@ class ProductionBidirectionalProxy:
         try:
             # Establish connection to target service
             logger.info(f"Establishing connection to {host}:{port}")
-            conn.local_reader, conn.local_writer = await asyncio.wait_for(
-                asyncio.open_connection(host, port),
+            loop = asyncio.get_running_loop()
+            conn.local_transport, conn.local_protocol = await asyncio.wait_for(
+                loop.create_connection(_ServiceProtocol, host, port),
                 timeout=10.0
             )
             
@@ -85,6 +257,7 @@ class ProductionBidirectionalProxy:
             conn.proxy_task = asyncio.create_task(
                 self._run_bidirectional_forwarding(conn)
             )
+            self.active_connections[_connection_key(conn)] = conn
             
             logger.info(f"Bidirectional forwarding established for {conn.src_port}->{conn.dst_port}")
             return True
@@ -129,28 +302,23 @@ class ProductionBidirectionalProxy:
         
         try:
             # Create a queue for PPP data
-            if not hasattr(conn, '_ppp_data_queue'):
-                conn._ppp_data_queue = asyncio.Queue()
+            if conn._ppp_data_queue is None:
+                conn._ppp_data_queue = asyncio.Queue(maxsize=self.queue_maxsize)
             
-            while conn.state == TCPState.ESTABLISHED and not conn._shutdown_event.is_set():
-                try:
-                    # Wait for data from PPP side (populated by TCP state machine)
-                    data = await asyncio.wait_for(
-                        conn._ppp_data_queue.get(),
-                        timeout=1.0
-                    )
-                    
-                    if not data:  # Shutdown signal
-                        break
-                    
-                    # Forward to service
-                    conn.local_writer.write(data)
-                    await conn.local_writer.drain()
-                    
-                    logger.debug(f"Forwarded {len(data)} bytes PPP -> Service")
-                    
-                except asyncio.TimeoutError:
-                    continue  # Check shutdown condition
+            while conn.state == TCPState.ESTABLISHED and not _is_shutdown(conn):
+                # Wait for data from PPP side (populated by TCP state machine).
+                # _signal_shutdown() queues a None sentinel, so no timeout is needed.
+                data = await conn._ppp_data_queue.get()
+                
+                if not data:  # Shutdown signal
+                    break
+                
+                # Forward to service
+                conn.local_transport.write(data)
+                await conn.local_protocol.drain()
+                
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Forwarded %d bytes PPP -> Service", len(data))
                     
         except Exception as e:
             logger.error(f"PPP -> Service forwarding error: {e}")
@@ -167,73 +335,120 @@ class ProductionBidirectionalProxy:
         logger.debug("Starting Service -> PPP forwarding")
         
         try:
-            while conn.state == TCPState.ESTABLISHED and not conn._shutdown_event.is_set():
+            while conn.state == TCPState.ESTABLISHED and not _is_shutdown(conn):
                 # Read data from service (blocks until data available)
-                data = await conn.local_reader.read(4096)
+                data = await conn.local_protocol.read()
                 
                 if not data:  # Service closed connection
                     logger.info("Service closed connection, initiating shutdown")
+                    await self.serial_writer.drain()  # Flush coalesced writes
                     break
                 
                 # Send data through PPP
                 await self._send_data_to_ppp(conn, data)
-                logger.debug(f"Forwarded {len(data)} bytes Service -> PPP")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Forwarded %d bytes Service -> PPP", len(data))
                 
         except Exception as e:
             logger.error(f"Service -> PPP forwarding error: {e}")
             raise
         finally:
             logger.debug("Service -> PPP forwarding stopped")
-            conn._shutdown_event.set()  # Signal other direction to stop
+            _signal_shutdown(conn)  # Signal other direction to stop
     
-    async def _send_data_to_ppp(self, conn: TCPConnection, data: bytes):
+    async def _send_data_to_ppp(self, conn: TCPConnection, data):
         """Send data from service back to PPP client"""
-        # Create TCP segment with PSH+ACK flags
+        # Build the PSH+ACK header once per connection, then patch it per segment
+        header = conn._tcp_ip_template
+        if header is None:
+            header = conn._tcp_ip_template = self._build_header_template(conn)
+        self._patch_header_template(conn, header, data)
+        
+        # Frame as PPP and hand the pieces to the transport without joining
+        # the payload in. The header template is patched again for the next
+        # segment, so it goes out as part of a new PPP+IP+TCP prefix.
+        self.serial_writer.writelines(
+            self._frame_ppp_chunks(_PPP_IP_HEADER + header, data)
+        )
+        if self.serial_writer.transport.get_write_buffer_size() >= _SERIAL_WRITE_HIGH_WATER:
+            await self.serial_writer.drain()
+        
+        # Update sequence number
+        conn.seq_num += len(data)
+    
+    def _build_header_template(self, conn: TCPConnection) -> bytearray:
+        """Build the 40-byte IP+TCP header reused for every service -> PPP segment"""
         tcp_segment = self.tcp_stack.create_tcp_segment(
             conn.dst_ip, conn.src_ip,  # Swap src/dst for response
             conn.dst_port, conn.src_port,
-            conn.seq_num, conn.ack_num,
-            0x18,  # PSH + ACK flags
-            data=data
+            0, 0, _FLAGS_PSH_ACK
         )
-        
-        # Create IP packet
-        ip_packet = self.tcp_stack.create_ip_packet(
+        header = bytearray(self.tcp_stack.create_ip_packet(
             conn.dst_ip, conn.src_ip, tcp_segment
-        )
+        ))
         
-        # Frame as PPP and send
-        ppp_frame = struct.pack('!BBH', 0xFF, 0x03, 0x0021) + ip_packet
-        framed = self._frame_ppp_data(ppp_frame)
+        # Checksum contribution of fields that never change: pseudo-header
+        # addresses and protocol, ports, data offset/flags, window, urgent pointer
+        _U16.pack_into(header, _TCP_CSUM_OFFSET, 0)
+        conn._tcp_csum_base = (6 +
+                               ones_complement_sum(header[12:20]) +
+                               ones_complement_sum(header[20:24]) +
+                               ones_complement_sum(header[32:40]))
+        return header
+    
+    def _patch_header_template(self, conn: TCPConnection, header: bytearray, data: bytes):
+        """Update length, IP id, seq/ack and both checksums in place"""
+        tcp_len = 20 + len(data)
+        seq = conn.seq_num & 0xFFFFFFFF
+        ack = conn.ack_num & 0xFFFFFFFF
         
-        self.serial_writer.write(framed)
-        await self.serial_writer.drain()
+        # IP header
+        self.tcp_stack.ip_id_counter = (self.tcp_stack.ip_id_counter + 1) & 0xFFFF
+        _LEN_ID.pack_into(header, _IP_LEN_OFFSET, 20 + tcp_len, self.tcp_stack.ip_id_counter)
+        _U16.pack_into(header, _IP_CSUM_OFFSET, 0)
+        _U16.pack_into(header, _IP_CSUM_OFFSET, ~ones_complement_sum(header[:20]) & 0xFFFF)
         
-        # Update sequence number
-        conn.seq_num += len(data)
+        # TCP header: only seq, ack, segment length and payload vary
+        _SEQ_ACK.pack_into(header, _TCP_SEQ_OFFSET, seq, ack)
+        checksum = (conn._tcp_csum_base + tcp_len +
+                    (seq >> 16) + (seq & 0xFFFF) + (ack >> 16) + (ack & 0xFFFF) +
+                    ones_complement_sum(data))
+        while checksum >> 16:
+            checksum = (checksum & 0xFFFF) + (checksum >> 16)
+        _U16.pack_into(header, _TCP_CSUM_OFFSET, ~checksum & 0xFFFF)
     
-    async def handle_ppp_data(self, conn: TCPConnection, data: bytes):
+    async def handle_ppp_data(self, conn: TCPConnection, data: bytes) -> bool:
         """
         Called by TCP state machine when data arrives from PPP
         
         Instead of forwarding directly, queue it for the forwarding task.
         This decouples TCP processing from data forwarding.
+        
+        Returns False if the data was not queued (no forwarding task, or the
+        queue is full because the service is stalled); the caller must not
+        ACK it so the peer retransmits later.
         """
-        if hasattr(conn, '_ppp_data_queue') and conn.proxy_task and not conn.proxy_task.done():
+        if conn._ppp_data_queue is not None and conn.proxy_task and not conn.proxy_task.done():
             try:
-                await conn._ppp_data_queue.put(data)
-            except Exception as e:
-                logger.error(f"Failed to queue PPP data: {e}")
+                conn._ppp_data_queue.put_nowait(data)
+                return True
+            except asyncio.QueueFull:
+                logger.warning("PPP -> Service queue full, withholding ACK for %d bytes", len(data))
         else:
-            logger.warning(f"No forwarding task available, dropping {len(data)} bytes")
+            logger.warning("No forwarding task available, dropping %d bytes", len(data))
+        return False
     
     async def _cleanup_connection(self, conn: TCPConnection):
         """Clean up connection resources with proper coordination"""
         logger.info(f"Cleaning up connection {conn.src_port}->{conn.dst_port}")
         
         # Signal shutdown to forwarding tasks
-        if conn._shutdown_event:
-            conn._shutdown_event.set()
+        _signal_shutdown(conn)
+        
+        # Drop any delayed ACK still waiting to fire
+        if conn._ack_timer is not None:
+            conn._ack_timer.cancel()
+            conn._ack_timer = None
         
         # Cancel proxy task
         if conn.proxy_task and not conn.proxy_task.done():
@@ -244,27 +459,34 @@ class ProductionBidirectionalProxy:
                 pass
         
         # Close service connection
-        if conn.local_writer:
-            conn.local_writer.close()
-            try:
-                await conn.local_writer.wait_closed()
-            except Exception:
-                pass
+        if conn.local_transport:
+            conn.local_transport.close()
         
         # Clear references
-        conn.local_reader = None
-        conn.local_writer = None
+        conn.local_transport = None
+        conn.local_protocol = None
         conn.proxy_task = None
         
         # Remove from active connections
-        key = f"{conn.src_port}->{conn.dst_port}"
-        self.active_connections.pop(key, None)
+        self.active_connections.pop(_connection_key(conn), None)
+    
+    @staticmethod
+    def _escape_ppp(data: bytes) -> bytes:
+        """Escape 0x7E/0x7D bytes for PPP transmission"""
+        # Fast path: `in` is a C-level memchr and almost no payload contains
+        # flag or escape bytes, so the data is returned untouched
+        if _PPP_FLAG_BYTE not in data and _PPP_ESCAPE_BYTE not in data:
+            return data
+        # Escape 0x7D first so the escapes inserted for 0x7E aren't re-escaped
+        return data.replace(_PPP_ESCAPE, _PPP_ESCAPED_ESCAPE).replace(_PPP_FLAG, _PPP_ESCAPED_FLAG)
     
     def _frame_ppp_data(self, data: bytes) -> bytes:
-        """Frame data for PPP transmission (implement actual PPP framing)"""
-        # This should implement proper PPP framing with escape sequences
-        # For now, return as-is (implement based on your PPP framing logic)
-        return data
+        """Frame data for PPP transmission (flag bytes + 0x7E/0x7D escaping)"""
+        return _PPP_FLAG + self._escape_ppp(data) + _PPP_FLAG
+    
+    def _frame_ppp_chunks(self, *parts: bytes) -> Tuple[bytes, ...]:
+        """Frame several buffers as one PPP frame, returned as chunks for writelines()"""
+        return (_PPP_FLAG,) + tuple(self._escape_ppp(part) for part in parts) + (_PPP_FLAG,)
 
 
 class ModifiedTCPHandler:
@@ -277,9 +499,24 @@ class ModifiedTCPHandler:
     3. Clean separation of concerns
     """
     
-    def __init__(self):
-        self.proxy = ProductionBidirectionalProxy(self.tcp_stack, self.serial_writer)
-        self.connections: Dict[str, TCPConnection] = {}
+    def __init__(self, tcp_stack=None, serial_writer: Optional[asyncio.StreamWriter] = None,
+                 config: Optional[Any] = None):
+        self.tcp_stack = tcp_stack
+        self.serial_writer = serial_writer
+        self.config = config
+        
+        # Resolve the port mapping once from the configured services
+        if config is not None:
+            self._port_mapping = {int(port): service.port
+                                  for port, service in config.services.items()
+                                  if service.enabled}
+            queue_maxsize = config.tcp.max_per_conn_buffer
+        else:
+            self._port_mapping = _DEFAULT_PORT_MAPPING
+            queue_maxsize = _PPP_QUEUE_MAXSIZE
+        
+        self.proxy = ProductionBidirectionalProxy(tcp_stack, serial_writer, queue_maxsize)
+        self.connections: Dict[ConnectionKey, TCPConnection] = {}
     
     async def _handle_established_state(self, conn: TCPConnection, segment_info: Dict, 
                                       tcp_stack, writer: asyncio.StreamWriter) -> Optional[bytes]:
@@ -289,7 +526,8 @@ class ModifiedTCPHandler:
         Key changes:
         1. Establish bidirectional forwarding ONCE when first entering ESTABLISHED
         2. Queue data for forwarding instead of forwarding inline
-        3. Return ACK responses without blocking on I/O
+        3. Send ACKs, immediate or delayed, via _send_ack() without blocking
+           on I/O (only an RST is returned to the caller)
         """
         flags = segment_info['flags']
         seq = segment_info['seq']
@@ -312,29 +550,67 @@ class ModifiedTCPHandler:
                 return self._create_rst_segment(tcp_stack, segment_info, conn)
         
         # Process data by queueing it for forwarding
-        if data and seq == conn.rcv_nxt:
+        in_order = bool(data) and seq == conn.rcv_nxt
+        if in_order:
+            # Queue data for forwarding instead of forwarding directly.
+            # If it can't be queued, leave rcv_nxt alone and don't ACK.
+            if not await self.proxy.handle_ppp_data(conn, data):
+                return None
             conn.rcv_nxt += len(data)
-            
-            # Queue data for forwarding instead of forwarding directly
-            await self.proxy.handle_ppp_data(conn, data)
-            logger.debug(f"Queued {len(data)} bytes for forwarding")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Queued %d bytes for forwarding", len(data))
         
         # Handle other flags (FIN, RST, etc.)
-        if flags & 0x01:  # FIN
+        if flags & _FLAG_FIN:
             conn.state = TCPState.CLOSING
-            conn._shutdown_event.set()  # Signal forwarding to stop
+            _signal_shutdown(conn)  # Signal forwarding to stop
         
-        # Return ACK (non-blocking)
-        return self._create_ack_segment(tcp_stack, segment_info, conn)
+        # Delay the ACK for the first in-order segment so that a following
+        # segment can be acknowledged together with it
+        if in_order and not flags & (_FLAG_FIN | _FLAG_PSH) and conn._ack_pending == 0:
+            conn._ack_pending = 1
+            conn._ack_timer = asyncio.get_running_loop().call_later(
+                _DELAYED_ACK_TIMEOUT, self._flush_delayed_ack, conn, tcp_stack, writer
+            )
+            return None
+        
+        # Send the ACK now (non-blocking), covering any delayed one
+        self._cancel_delayed_ack(conn)
+        self._send_ack(conn, tcp_stack, writer)
+        return None
+    
+    def _send_ack(self, conn: TCPConnection, tcp_stack, writer: asyncio.StreamWriter):
+        """Send a pure ACK for everything received so far"""
+        # Built from the connection's state at send time, so a delayed ACK
+        # covers every segment received while it was held back
+        conn.ack_num = conn.rcv_nxt
+        tcp_segment = tcp_stack.create_tcp_segment(
+            conn.dst_ip, conn.src_ip,  # Swap src/dst for response
+            conn.dst_port, conn.src_port,
+            conn.seq_num & 0xFFFFFFFF, conn.ack_num & 0xFFFFFFFF, _FLAG_ACK
+        )
+        ip_packet = tcp_stack.create_ip_packet(conn.dst_ip, conn.src_ip, tcp_segment)
+        writer.writelines(self.proxy._frame_ppp_chunks(_PPP_IP_HEADER, ip_packet))
+    
+    def _flush_delayed_ack(self, conn: TCPConnection, tcp_stack,
+                           writer: asyncio.StreamWriter):
+        """Timer callback: send the ACK that was held back"""
+        conn._ack_timer = None
+        conn._ack_pending = 0
+        if conn.state != TCPState.ESTABLISHED:
+            return
+        self._send_ack(conn, tcp_stack, writer)
+    
+    def _cancel_delayed_ack(self, conn: TCPConnection):
+        """Cancel a pending delayed ACK (it is being sent now)"""
+        if conn._ack_timer is not None:
+            conn._ack_timer.cancel()
+            conn._ack_timer = None
+        conn._ack_pending = 0
     
     def _map_service_port(self, ppp_port: int) -> int:
         """Map PPP destination port to actual service port"""
-        port_mapping = {
-            22: 22,    # SSH
-            80: 80,    # HTTP
-            443: 443,  # HTTPS
-        }
-        return port_mapping.get(ppp_port, ppp_port)
+        return self._port_mapping.get(ppp_port, ppp_port)
 
 
 # Usage Example
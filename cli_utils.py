@@ -5,15 +5,32 @@ Command line argument parsing and validation functions
 """
 
 import argparse
-import platform
+import os
 import sys
 
-from config_manager import ConfigManager
 from safe_logger import get_safe_logger
 
 logger = get_safe_logger(__name__)
 
+VERSION = 'PyLiRP 1.0.0'
+
+# Resolved once; also used by main.py to gate Windows-only commands
+IS_WINDOWS = sys.platform.startswith('win')
+
+# Parser is immutable once built, so it is shared by every caller
+_PARSER = None
+
+# serial_asyncio module, imported on the first serial port test
+_serial_asyncio = None
+
 def create_argument_parser():
+    """Return the command line argument parser, building it on first use"""
+    global _PARSER
+    if _PARSER is None:
+        _PARSER = _build_argument_parser()
+    return _PARSER
+
+def _build_argument_parser():
     """Create command line argument parser"""
     parser = argparse.ArgumentParser(
         description='PyLiRP - Python SLiRP PPP Bridge',
@@ -103,7 +120,7 @@ Examples:
     parser.add_argument(
         '--version',
         action='version',
-        version='PyLiRP 1.0.0'
+        version=VERSION
     )
     
     parser.add_argument(
@@ -120,7 +137,7 @@ Examples:
     )
     
     # Windows-specific arguments
-    if platform.system() == 'Windows':
+    if IS_WINDOWS:
         parser.add_argument(
             '--install-service',
             action='store_true',
@@ -167,16 +184,20 @@ Examples:
 
 async def validate_configuration(config_file: str, environment: str = None):
     """Validate configuration file"""
+    # Imported here so --help/--version don't pay for YAML and config setup
+    from config_manager import ConfigManager
+    
     try:
         config_manager = ConfigManager()
-        config = config_manager.load_config(config_file, environment)
+        config_manager.load_config(config_file, environment)
+        summary = config_manager.summary
         
         print("✓ Configuration is valid")
-        print(f"  Serial port: {config.serial.port}")
-        print(f"  Baudrate: {config.serial.baudrate}")
-        print(f"  Services: {len(config.services)} configured")
-        print(f"  Security: {'enabled' if config.security else 'disabled'}")
-        print(f"  Monitoring: {'enabled' if config.monitoring.enable_metrics else 'disabled'}")
+        print(f"  Serial port: {summary.serial_port}")
+        print(f"  Baudrate: {summary.baudrate}")
+        print(f"  Services: {summary.service_count} configured")
+        print(f"  Security: {'enabled' if summary.security_enabled else 'disabled'}")
+        print(f"  Monitoring: {'enabled' if summary.monitoring_enabled else 'disabled'}")
         
         return True
         
@@ -186,13 +207,16 @@ async def validate_configuration(config_file: str, environment: str = None):
 
 async def test_serial_port(serial_port: str, baudrate: int = 115200):
     """Test serial port connectivity"""
+    global _serial_asyncio
     try:
-        import serial_asyncio
+        if _serial_asyncio is None:
+            import serial_asyncio
+            _serial_asyncio = serial_asyncio
         
         print(f"Testing serial port: {serial_port} at {baudrate} baud")
         
         # Try to open serial connection
-        reader, writer = await serial_asyncio.open_serial_connection(
+        reader, writer = await _serial_asyncio.open_serial_connection(
             url=serial_port,
             baudrate=baudrate,
             timeout=5
@@ -232,71 +256,86 @@ def check_virtual_environment():
     
     return in_venv
 
+async def _list_com_ports(args, windows_manager):
+    """Print the available COM ports"""
+    print("Available COM ports:")
+    ports = windows_manager.platform_manager.get_com_ports()
+    if ports:
+        for port in ports:
+            print(f"  {port['device']}: {port['description']}")
+    else:
+        print("  No COM ports found")
+
+async def _install_service(args, windows_manager):
+    """Install PyLiRP as a Windows (or userspace) service"""
+    userspace = getattr(args, 'userspace', None)
+    script_path = os.path.abspath(sys.argv[0])
+    paths = windows_manager.platform_manager.get_default_paths(
+        portable=False, 
+        admin_mode=not userspace if userspace is not None else None
+    )
+    config_path = args.config or os.path.join(paths['config_dir'], 'config.yaml')
+    
+    # Use userspace mode if no admin privileges or explicitly requested
+    use_userspace = bool(userspace) or \
+                   not windows_manager.platform_manager.admin_privileges
+    
+    success = await windows_manager.service_manager.install_service(
+        script_path, config_path, userspace=use_userspace, method='service'
+    )
+    if success:
+        service_type = "userspace service" if use_userspace else "Windows service"
+        print(f"{service_type} installed successfully")
+        windows_manager.show_notification(
+            "PyLiRP", f"{service_type} installed successfully", "info"
+        )
+    else:
+        print("Failed to install service")
+
+async def _install_task(args, windows_manager):
+    """Install PyLiRP as a userspace scheduled task"""
+    script_path = os.path.abspath(sys.argv[0])
+    paths = windows_manager.platform_manager.get_default_paths(portable=False)
+    config_path = args.config or os.path.join(paths['config_dir'], 'config.yaml')
+    
+    success = await windows_manager.service_manager.install_service(
+        script_path, config_path, userspace=True, method='task'
+    )
+    if success:
+        print("Windows scheduled task installed successfully")
+        print("Task name: PyLiRP-UserSpace")
+    else:
+        print("Failed to install scheduled task")
+
+async def _uninstall_service(args, windows_manager):
+    """Uninstall the PyLiRP Windows service"""
+    success = await windows_manager.uninstall_service()
+    if success:
+        print("Windows service uninstalled successfully")
+    else:
+        print("Failed to uninstall Windows service")
+
+# Windows-only actions in priority order: (args attribute, handler)
+_WIN_ACTIONS = (
+    ('list_com_ports', _list_com_ports),
+    ('install_service', _install_service),
+    ('install_task', _install_task),
+    ('uninstall_service', _uninstall_service),
+)
+
 async def handle_windows_commands(args):
     """Handle Windows-specific command line arguments"""
+    for name, action in _WIN_ACTIONS:
+        if getattr(args, name, False):
+            break
+    else:
+        return False
+    
     from windows_support import get_windows_manager
-    import os
     
     windows_manager = get_windows_manager()
     if not windows_manager:
         return False
     
-    if hasattr(args, 'list_com_ports') and args.list_com_ports:
-        print("Available COM ports:")
-        ports = windows_manager.platform_manager.get_com_ports()
-        if ports:
-            for port in ports:
-                print(f"  {port['device']}: {port['description']}")
-        else:
-            print("  No COM ports found")
-        return True
-    
-    if hasattr(args, 'install_service') and args.install_service:
-        script_path = os.path.abspath(sys.argv[0])
-        paths = windows_manager.platform_manager.get_default_paths(
-            portable=False, 
-            admin_mode=not args.userspace if hasattr(args, 'userspace') else None
-        )
-        config_path = args.config or os.path.join(paths['config_dir'], 'config.yaml')
-        
-        # Use userspace mode if no admin privileges or explicitly requested
-        use_userspace = (hasattr(args, 'userspace') and args.userspace) or \
-                       not windows_manager.platform_manager.admin_privileges
-        
-        success = await windows_manager.service_manager.install_service(
-            script_path, config_path, userspace=use_userspace, method='service'
-        )
-        if success:
-            service_type = "userspace service" if use_userspace else "Windows service"
-            print(f"{service_type} installed successfully")
-            windows_manager.show_notification(
-                "PyLiRP", f"{service_type} installed successfully", "info"
-            )
-        else:
-            print("Failed to install service")
-        return True
-    
-    if hasattr(args, 'install_task') and args.install_task:
-        script_path = os.path.abspath(sys.argv[0])
-        paths = windows_manager.platform_manager.get_default_paths(portable=False)
-        config_path = args.config or os.path.join(paths['config_dir'], 'config.yaml')
-        
-        success = await windows_manager.service_manager.install_service(
-            script_path, config_path, userspace=True, method='task'
-        )
-        if success:
-            print("Windows scheduled task installed successfully")
-            print("Task name: PyLiRP-UserSpace")
-        else:
-            print("Failed to install scheduled task")
-        return True
-    
-    if hasattr(args, 'uninstall_service') and args.uninstall_service:
-        success = await windows_manager.uninstall_service()
-        if success:
-            print("Windows service uninstalled successfully")
-        else:
-            print("Failed to uninstall Windows service")
-        return True
-    
-    return False
\ No newline at end of file
+    await action(args, windows_manager)
+    return True
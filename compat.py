@@ -0,0 +1,13 @@
+#!/usr/bin/env python3
+"""
+Compatibility Helpers for PyLiRP
+Python version dependent settings shared across modules
+"""
+
+import sys
+
+# Dataclass slots need Python 3.10+; older interpreters get a regular __dict__
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+# Slotted classes that are also weakly referenced need weakref_slot from 3.11
+_WEAKREF_SLOTS = {'slots': True, 'weakref_slot': True} if sys.version_info >= (3, 11) else {}
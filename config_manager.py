@@ -5,18 +5,187 @@ Handles YAML configuration loading, validation, and environment-specific overrid
 """
 
 import os
+import re
 import sys
-import yaml
+import marshal
+import hashlib
+import functools
+import logging
+import socket
 from pathlib import Path
-from typing import Dict, Any, Optional, Union, List
-from dataclasses import dataclass, field
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Union, List, Tuple
+from dataclasses import dataclass, field, fields, is_dataclass
 from copy import deepcopy
 
 from safe_logger import get_safe_logger
+from compat import _SLOTS
 
 logger = get_safe_logger(__name__)
 
-@dataclass
+# Log level names accepted for logging.level and logging.components
+_LEVEL_MAP = {name: getattr(logging, name)
+              for name in ('CRITICAL', 'ERROR', 'WARNING', 'INFO', 'DEBUG', 'NOTSET')}
+
+# Locations searched, in order, when no configuration file is given
+_CONFIG_SEARCH_PATHS = (
+    "config.yaml",
+    "pyslirp.yaml",
+    "/etc/pyslirp/config.yaml",
+    "/usr/local/etc/pyslirp/config.yaml",
+    os.path.expanduser("~/.config/pyslirp/config.yaml"),
+    os.path.join(os.path.dirname(__file__), "config.yaml"),
+)
+
+# Proxy types accepted when proxy.enabled is set
+_PROXY_TYPES = frozenset(('socks5', 'http'))
+
+# Size strings such as "10MB", "512 kb" or "1G" (logging.file.max_size etc.)
+_SIZE_RE = re.compile(r'^\s*(\d+)\s*([KMGT]?)B?\s*$', re.IGNORECASE)
+_SIZE_MULT = {'': 1, 'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3, 'T': 1024 ** 4}
+
+# Parsed YAML is cached in a marshal sidecar next to the source file; marshal
+# round-trips the parsed tree exactly (int keys stay ints), and the first line
+# carries a content-version key so freshness can be checked cheaply. Like
+# pickle, marshal is not safe for untrusted data, hence the use_binary_cache
+# opt-out on ConfigManager.
+_CACHE_SUFFIX = '.cache.marshal'
+_CACHE_HEADER = b'# content-version: '
+
+def _yaml_cache_key(file_path: str, mtime_ns: int, size: int) -> str:
+    """Build the sidecar freshness key from path, mtime and size"""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(os.fsencode(file_path))
+    digest.update(str(mtime_ns).encode())
+    digest.update(str(size).encode())
+    return digest.hexdigest()
+
+def _read_yaml_sidecar(sidecar_path: str, key: str) -> Optional[Dict[str, Any]]:
+    """Return cached data if the sidecar exists and matches key"""
+    try:
+        with open(sidecar_path, 'rb') as f:
+            if f.readline().rstrip(b'\n') != _CACHE_HEADER + key.encode():
+                return None
+            return marshal.load(f)
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+
+def _write_yaml_sidecar(sidecar_path: str, key: str, data: Dict[str, Any]):
+    """Atomically write the sidecar; failures are ignored (cache is optional)"""
+    try:
+        payload = marshal.dumps(data)
+    except ValueError:
+        return  # YAML contained types marshal can't represent (e.g. dates)
+    
+    tmp_path = f"{sidecar_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(_CACHE_HEADER + key.encode() + b'\n')
+            f.write(payload)
+        os.replace(tmp_path, sidecar_path)
+    except OSError:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+
+# PyYAML is only imported when a file actually has to be parsed; loads
+# served from a fresh sidecar never pay for it
+_yaml = None
+_YAMLLoader = None
+
+def _parse_yaml(stream) -> Any:
+    """Parse a YAML stream, preferring LibYAML's CSafeLoader when available"""
+    global _yaml, _YAMLLoader
+    if _yaml is None:
+        import yaml
+        _YAMLLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+        _yaml = yaml
+    try:
+        return _yaml.load(stream, Loader=_YAMLLoader)
+    except _yaml.YAMLError as e:
+        raise ConfigurationError(f"Invalid YAML in {getattr(stream, 'name', '<stream>')}: {e}")
+
+@functools.lru_cache(maxsize=16)
+def _load_yaml_cached(file_path: str, mtime_ns: int, size: int,
+                      use_binary_cache: bool = True) -> Dict[str, Any]:
+    """
+    Load a YAML file via its marshal sidecar when fresh, else parse and refresh it.
+    
+    With use_binary_cache off the sidecar is neither read nor written.
+    Results are shared between callers and must be treated as read-only.
+    """
+    if use_binary_cache:
+        key = _yaml_cache_key(file_path, mtime_ns, size)
+        sidecar_path = file_path + _CACHE_SUFFIX
+        
+        data = _read_yaml_sidecar(sidecar_path, key)
+        if data is not None:
+            return data
+    
+    with open(file_path, 'rb') as f:
+        data = _parse_yaml(f) or {}
+    if use_binary_cache:
+        _write_yaml_sidecar(sidecar_path, key, data)
+    return data
+
+# Config dataclass -> {field name: (field type, is nested dataclass)},
+# filled on first use
+_FIELD_TYPES: Dict[type, Dict[str, Tuple[Any, bool]]] = {}
+
+# Environment variable overrides: (variable, config path, value converter)
+_ENV_MAPPINGS = (
+    ('PYSLIRP_SERIAL_PORT', ('serial', 'port'), str),
+    ('PYSLIRP_SERIAL_BAUDRATE', ('serial', 'baudrate'), int),
+    ('PYSLIRP_LOCAL_IP', ('network', 'local_ip'), str),
+    ('PYSLIRP_REMOTE_IP', ('network', 'remote_ip'), str),
+    ('PYSLIRP_LOG_LEVEL', ('logging', 'level'), str),
+    ('PYSLIRP_LOG_FILE', ('logging', 'file', 'path'), str),
+    ('PYSLIRP_SOCKS_HOST', ('proxy', 'host'), str),
+    ('PYSLIRP_SOCKS_PORT', ('proxy', 'port'), int),
+    ('PYSLIRP_METRICS_PORT', ('monitoring', 'metrics_port'), int),
+)
+
+# Leaf types returned as-is by _clone; checked first since most values are leaves
+_ATOMIC_TYPES = frozenset((int, float, bool, type(None), bytes))
+
+# Short strings (level names, section keys, addresses) recur throughout a
+# config; _clone interns them so later comparisons hit identity
+_INTERN_MAX_LEN = 32
+
+def _clone(obj):
+    """
+    Copy a parsed config tree; only dicts and lists are mutable in it.
+    
+    Short string keys and values are interned on the way, so the single
+    copy made per load also does the interning.
+    """
+    t = type(obj)
+    if t is str:
+        return sys.intern(obj) if len(obj) < _INTERN_MAX_LEN else obj
+    if t in _ATOMIC_TYPES:
+        return obj
+    if t is dict:
+        return {_clone(k): _clone(v) for k, v in obj.items()}
+    if t is list:
+        return [_clone(v) for v in obj]
+    return obj
+
+# Fully built Config objects keyed by (path, environment, mode, PYSLIRP_* env),
+# each stored with the stat signature of the files it was built from and
+# its ConfigSummary
+_CONFIG_CACHE: "OrderedDict[tuple, Tuple[tuple, Any, Any]]" = OrderedDict()
+_CONFIG_CACHE_MAX = 100
+
+def _stat_signature(file_path: str) -> Optional[Tuple[int, int]]:
+    """Return (mtime_ns, size) for a file, or None if it cannot be stat'ed"""
+    try:
+        st = os.stat(file_path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+@dataclass(**_SLOTS)
 class SerialConfig:
     """Serial port configuration"""
     port: str = "/dev/ttyUSB0"
@@ -25,7 +194,7 @@ class SerialConfig:
     timeout: float = 5.0
     write_timeout: float = 2.0
 
-@dataclass
+@dataclass(**_SLOTS)
 class NetworkConfig:
     """Network configuration"""
     local_ip: str = "10.0.0.1"
@@ -33,7 +202,7 @@ class NetworkConfig:
     mtu: int = 1500
     netmask: str = "255.255.255.0"
 
-@dataclass
+@dataclass(**_SLOTS)
 class PPPConfig:
     """PPP protocol configuration"""
     lcp_echo_interval: int = 30
@@ -46,7 +215,7 @@ class PPPConfig:
     default_mru: int = 1500
     magic_number: Optional[int] = None
 
-@dataclass
+@dataclass(**_SLOTS)
 class TCPConfig:
     """TCP stack configuration"""
     initial_window_size: int = 8192
@@ -63,8 +232,9 @@ class TCPConfig:
     initial_cwnd: int = 10
     slow_start_threshold: int = 65535
     duplicate_ack_threshold: int = 3
+    max_per_conn_buffer: int = 64  # PPP -> service segments queued per connection
 
-@dataclass
+@dataclass(**_SLOTS)
 class ServiceConfig:
     """Individual service configuration"""
     host: str = "127.0.0.1"
@@ -74,7 +244,7 @@ class ServiceConfig:
     max_connections: int = 50
     connection_timeout: int = 60
 
-@dataclass
+@dataclass(**_SLOTS)
 class ProxyConfig:
     """Proxy configuration"""
     type: str = "none"  # none/socks5/http
@@ -85,7 +255,7 @@ class ProxyConfig:
     connection_timeout: int = 10
     enabled: bool = False
 
-@dataclass
+@dataclass(**_SLOTS)
 class RateLimitConfig:
     """Rate limiting configuration"""
     enabled: bool = True
@@ -93,14 +263,14 @@ class RateLimitConfig:
     burst_size: int = 20
     window_size: int = 60
 
-@dataclass
+@dataclass(**_SLOTS)
 class ConnectionLimitsConfig:
     """Connection limits configuration"""
     global_max_connections: int = 200
     per_service_max: int = 50
     per_ip_max: int = 20
 
-@dataclass
+@dataclass(**_SLOTS)
 class SecurityConfig:
     """Security configuration"""
     allowed_ports: List[int] = field(default_factory=lambda: [22, 80, 443])
@@ -111,7 +281,7 @@ class SecurityConfig:
     log_rejected_connections: bool = True
     log_rate_limit_violations: bool = True
 
-@dataclass
+@dataclass(**_SLOTS)
 class FileLoggingConfig:
     """File logging configuration"""
     enabled: bool = True
@@ -119,13 +289,13 @@ class FileLoggingConfig:
     max_size: str = "10MB"
     rotate_count: int = 5
 
-@dataclass
+@dataclass(**_SLOTS)
 class ConsoleLoggingConfig:
     """Console logging configuration"""
     enabled: bool = True
     color: bool = True
 
-@dataclass
+@dataclass(**_SLOTS)
 class LoggingConfig:
     """Logging configuration"""
     level: str = "INFO"
@@ -141,14 +311,14 @@ class LoggingConfig:
         'metrics': 'INFO'
     })
 
-@dataclass
+@dataclass(**_SLOTS)
 class HealthCheckConfig:
     """Health check configuration"""
     enabled: bool = True
     port: int = 9091
     path: str = "/health"
 
-@dataclass  
+@dataclass(**_SLOTS)
 class PacketCaptureConfig:
     """Packet capture configuration"""
     enabled: bool = False
@@ -156,7 +326,7 @@ class PacketCaptureConfig:
     max_file_size: str = "100MB"
     rotate_files: bool = True
 
-@dataclass
+@dataclass(**_SLOTS)
 class PerformanceConfig:
     """Performance monitoring configuration"""
     track_connection_stats: bool = True
@@ -164,7 +334,7 @@ class PerformanceConfig:
     track_latency: bool = True
     stats_interval: int = 30
 
-@dataclass
+@dataclass(**_SLOTS)
 class MonitoringConfig:
     """Monitoring configuration"""
     enable_metrics: bool = True
@@ -174,7 +344,7 @@ class MonitoringConfig:
     packet_capture: PacketCaptureConfig = field(default_factory=PacketCaptureConfig)
     performance: PerformanceConfig = field(default_factory=PerformanceConfig)
 
-@dataclass
+@dataclass(**_SLOTS)
 class CircuitBreakerConfig:
     """Circuit breaker configuration"""
     enabled: bool = True
@@ -182,7 +352,7 @@ class CircuitBreakerConfig:
     recovery_timeout: int = 60
     half_open_max_calls: int = 3
 
-@dataclass
+@dataclass(**_SLOTS)
 class ErrorRecoveryConfig:
     """Error recovery configuration"""
     auto_reconnect_serial: bool = True
@@ -195,14 +365,14 @@ class ErrorRecoveryConfig:
     tcp_connection_cleanup_interval: int = 60
     orphaned_connection_timeout: int = 300
 
-@dataclass
+@dataclass(**_SLOTS)
 class MockServicesConfig:
     """Mock services configuration for testing"""
     enabled: bool = False
     echo_port: int = 7777
     discard_port: int = 7778
 
-@dataclass
+@dataclass(**_SLOTS)
 class DevelopmentConfig:
     """Development and testing configuration"""
     debug_packets: bool = False
@@ -212,7 +382,7 @@ class DevelopmentConfig:
     artificial_latency_ms: int = 0
     mock_services: MockServicesConfig = field(default_factory=MockServicesConfig)
 
-@dataclass
+@dataclass(**_SLOTS)
 class Config:
     """Main configuration class"""
     serial: SerialConfig = field(default_factory=SerialConfig)
@@ -229,17 +399,64 @@ class Config:
     port_forwards: Dict[int, int] = field(default_factory=dict)  # For client mode: local->remote
     mode: str = "host"  # Operation mode: 'host' or 'client'
 
+@dataclass(frozen=True, **_SLOTS)
+class ConfigSummary:
+    """Headline settings of a loaded configuration, computed once per load"""
+    serial_port: Optional[str]
+    baudrate: int
+    service_count: int
+    security_enabled: bool
+    monitoring_enabled: bool
+    
+    @classmethod
+    def from_config(cls, config: 'Config') -> 'ConfigSummary':
+        return cls(
+            serial_port=config.serial.port,
+            baudrate=config.serial.baudrate,
+            service_count=len(config.services),
+            security_enabled=bool(config.security),
+            monitoring_enabled=bool(config.monitoring.enable_metrics),
+        )
+
 class ConfigurationError(Exception):
     """Configuration-related error"""
     pass
 
+def parse_size(value: Union[str, int]) -> int:
+    """Convert a size string like "10MB" to bytes"""
+    if isinstance(value, int):
+        return value
+    match = _SIZE_RE.match(str(value))
+    if not match:
+        raise ConfigurationError(f"Invalid size: {value!r}")
+    return int(match.group(1)) * _SIZE_MULT[match.group(2).upper()]
+
+def _is_ip_address(value: Any) -> bool:
+    """Check for a literal IPv4 (dotted quad) or IPv6 address"""
+    for family in (socket.AF_INET, socket.AF_INET6):
+        try:
+            socket.inet_pton(family, value)
+            return True
+        except (OSError, TypeError, ValueError):
+            pass
+    return False
+
 class ConfigManager:
     """Configuration manager with validation and environment support"""
     
-    def __init__(self):
+    def __init__(self, use_binary_cache: bool = True):
         self.config: Optional[Config] = None
+        self.summary: Optional[ConfigSummary] = None
         self._config_file: Optional[str] = None
         
+        # Read and write the marshal parse cache next to each YAML file;
+        # turn off where the config directory may hold untrusted files
+        self.use_binary_cache = use_binary_cache
+        
+        # Set views of security lists, tied to the Config they came from
+        self._security_sets_config: Optional[Config] = None
+        self._security_sets_cache: Tuple[frozenset, frozenset] = (frozenset(), frozenset())
+        
     def load_config(self, config_file: Optional[str] = None, 
                    environment: Optional[str] = None,
                    mode: Optional[str] = None) -> Config:
@@ -254,12 +471,22 @@ class ConfigManager:
         Returns:
             Loaded and validated configuration
         """
-        # Determine config file path
+        # Determine config file path, reusing the one found by a previous load
         if config_file is None:
-            config_file = self._find_config_file()
+            config_file = self._config_file or self._find_config_file()
         
         self._config_file = config_file
         
+        # Reuse a previously built configuration if none of its inputs changed
+        cache_key, signature = self._config_cache_key(config_file, environment, mode)
+        cached = _CONFIG_CACHE.get(cache_key)
+        if cached is not None and signature[0] is not None and cached[0] == signature:
+            _CONFIG_CACHE.move_to_end(cache_key)
+            self.config = deepcopy(cached[1])
+            self.summary = cached[2]
+            logger.debug(f"Configuration for {config_file} served from cache")
+            return self.config
+        
         # Load main configuration
         main_config = self._load_yaml_file(config_file)
         
@@ -292,37 +519,56 @@ class ConfigManager:
         logger.info(f"Configuration loaded from {config_file}")
         if environment:
             logger.info(f"Applied environment overrides for: {environment}")
+        
+        # Callers may mutate self.config, so the cache keeps its own copy
+        self.summary = ConfigSummary.from_config(self.config)
+        _CONFIG_CACHE[cache_key] = (signature, deepcopy(self.config), self.summary)
+        _CONFIG_CACHE.move_to_end(cache_key)
+        while len(_CONFIG_CACHE) > _CONFIG_CACHE_MAX:
+            _CONFIG_CACHE.popitem(last=False)
             
         return self.config
     
+    def _config_cache_key(self, config_file: str, environment: Optional[str],
+                          mode: Optional[str]) -> Tuple[tuple, tuple]:
+        """Build the Config cache key and the stat signature validating it"""
+        env_overrides = tuple(sorted(
+            (k, v) for k, v in os.environ.items() if k.startswith('PYSLIRP_')))
+        key = (os.path.abspath(config_file), environment, mode, env_overrides)
+        
+        signature = (_stat_signature(config_file),)
+        if environment:
+            base_dir = os.path.dirname(config_file)
+            base_name = os.path.splitext(os.path.basename(config_file))[0]
+            env_file = os.path.join(base_dir, f"{base_name}.{environment}.yaml")
+            signature += (_stat_signature(env_file),)
+        return key, signature
+    
     def _find_config_file(self) -> str:
         """Find configuration file in standard locations"""
-        search_paths = [
-            "config.yaml",
-            "pyslirp.yaml",
-            "/etc/pyslirp/config.yaml",
-            "/usr/local/etc/pyslirp/config.yaml",
-            os.path.expanduser("~/.config/pyslirp/config.yaml"),
-            os.path.join(os.path.dirname(__file__), "config.yaml")
-        ]
-        
-        for path in search_paths:
+        for path in _CONFIG_SEARCH_PATHS:
             if os.path.isfile(path):
                 return path
                 
         raise ConfigurationError(
-            f"Configuration file not found. Searched: {search_paths}"
+            f"Configuration file not found. Searched: {list(_CONFIG_SEARCH_PATHS)}"
         )
     
     def _load_yaml_file(self, file_path: str) -> Dict[str, Any]:
-        """Load YAML configuration file"""
+        """
+        Load YAML configuration file (cached by path, mtime and size)
+        
+        Returns a private copy, so callers may modify it freely.
+        """
         try:
-            with open(file_path, 'r') as f:
-                return yaml.safe_load(f) or {}
+            file_path = os.path.abspath(file_path)
+            st = os.stat(file_path)
+            return _clone(_load_yaml_cached(file_path, st.st_mtime_ns, st.st_size,
+                                            self.use_binary_cache))
         except FileNotFoundError:
             raise ConfigurationError(f"Configuration file not found: {file_path}")
-        except yaml.YAMLError as e:
-            raise ConfigurationError(f"Invalid YAML in {file_path}: {e}")
+        except ConfigurationError:
+            raise
         except Exception as e:
             raise ConfigurationError(f"Error loading {file_path}: {e}")
     
@@ -343,51 +589,62 @@ class ConfigManager:
     def _merge_configs(self, base: Dict[str, Any], 
                       override: Dict[str, Any]) -> Dict[str, Any]:
         """Recursively merge configuration dictionaries"""
-        result = deepcopy(base)
+        # Single pass: base subtrees are cloned only where override doesn't
+        # replace them, and key order matches a copy-then-update merge
+        result = {}
         
-        for key, value in override.items():
-            if key in result and isinstance(result[key], dict) and isinstance(value, dict):
-                result[key] = self._merge_configs(result[key], value)
+        for key, value in base.items():
+            if key in override:
+                override_value = override[key]
+                if isinstance(value, dict) and isinstance(override_value, dict):
+                    result[key] = self._merge_configs(value, override_value)
+                else:
+                    result[key] = override_value
             else:
+                result[key] = _clone(value)
+        
+        for key, value in override.items():
+            if key not in result:
                 result[key] = value
                 
         return result
     
     def _apply_env_overrides(self, config: Dict[str, Any]) -> Dict[str, Any]:
-        """Apply environment variable overrides using PYSLIRP_ prefix"""
-        result = deepcopy(config)
-        
-        # Define environment variable mappings
-        env_mappings = {
-            'PYSLIRP_SERIAL_PORT': ['serial', 'port'],
-            'PYSLIRP_SERIAL_BAUDRATE': ['serial', 'baudrate'],
-            'PYSLIRP_LOCAL_IP': ['network', 'local_ip'],
-            'PYSLIRP_REMOTE_IP': ['network', 'remote_ip'],
-            'PYSLIRP_LOG_LEVEL': ['logging', 'level'],
-            'PYSLIRP_LOG_FILE': ['logging', 'file', 'path'],
-            'PYSLIRP_SOCKS_HOST': ['proxy', 'host'],
-            'PYSLIRP_SOCKS_PORT': ['proxy', 'port'],
-            'PYSLIRP_METRICS_PORT': ['monitoring', 'metrics_port'],
-        }
-        
-        for env_var, config_path in env_mappings.items():
-            env_value = os.environ.get(env_var)
-            if env_value is not None:
-                # Navigate to the nested dictionary
-                current = result
-                for key in config_path[:-1]:
-                    if key not in current:
-                        current[key] = {}
+        """
+        Apply environment variable overrides using PYSLIRP_ prefix
+        
+        The input is never modified. Only the dictionaries along overridden
+        paths are copied, so the result shares untouched subtrees with it.
+        """
+        present = [(env_var, config_path, convert)
+                   for env_var, config_path, convert in _ENV_MAPPINGS
+                   if env_var in os.environ]
+        if not present:
+            return config
+        
+        result = dict(config)
+        copied = {id(result)}
+        
+        for env_var, config_path, convert in present:
+            env_value = os.environ[env_var]
+            
+            # Navigate to the nested dictionary, copying it on first write
+            current = result
+            for key in config_path[:-1]:
+                if key not in current:
+                    child = {}
+                elif type(current[key]) is dict and id(current[key]) not in copied:
+                    child = dict(current[key])
+                else:
                     current = current[key]
+                    continue
+                copied.add(id(child))
+                current[key] = child
+                current = child
+            
+            current[config_path[-1]] = convert(env_value)
                 
-                # Convert value to appropriate type
-                final_key = config_path[-1]
-                if final_key in ['baudrate', 'port', 'metrics_port']:
-                    current[final_key] = int(env_value)
-                else:
-                    current[final_key] = env_value
-                    
-                logger.info(f"Applied environment override: {env_var}={env_value}")
+            logger.info(f"Applied environment override: {env_var}={env_value}")
         
         return result
     
@@ -395,10 +652,10 @@ class ConfigManager:
         """Create configuration objects from dictionary"""
         try:
             # Create service configurations
-            services = {}
-            if 'services' in config_dict:
-                for port, service_config in config_dict['services'].items():
-                    services[int(port)] = ServiceConfig(**service_config)
+            services = {
+                int(port): ServiceConfig(**service_config)
+                for port, service_config in config_dict.get('services', {}).items()
+            }
             
             # Create main config object
             config_kwargs = {}
@@ -425,10 +682,10 @@ class ConfigManager:
             # Handle port_forwards (for client mode)
             if 'port_forwards' in config_dict:
                 # Convert string keys to integers
-                port_forwards = {}
-                for local_port, remote_port in config_dict['port_forwards'].items():
-                    port_forwards[int(local_port)] = int(remote_port)
-                config_kwargs['port_forwards'] = port_forwards
+                config_kwargs['port_forwards'] = {
+                    int(local_port): int(remote_port)
+                    for local_port, remote_port in config_dict['port_forwards'].items()
+                }
             
             return Config(**config_kwargs)
             
@@ -439,15 +696,18 @@ class ConfigManager:
                             config_class: type) -> Any:
         """Create nested configuration objects recursively"""
         # Handle nested dataclasses
-        annotations = getattr(config_class, '__annotations__', {})
+        field_types = _FIELD_TYPES.get(config_class)
+        if field_types is None:
+            field_types = _FIELD_TYPES[config_class] = {
+                f.name: (f.type, is_dataclass(f.type)) for f in fields(config_class)
+            }
         kwargs = {}
         
-        for field_name, field_type in annotations.items():
+        for field_name, (field_type, nested) in field_types.items():
             if field_name in config_dict:
                 value = config_dict[field_name]
                 
-                # Check if it's a nested dataclass
-                if hasattr(field_type, '__annotations__'):
+                if nested:
                     kwargs[field_name] = self._create_nested_config(value, field_type)
                 else:
                     kwargs[field_name] = value
@@ -463,12 +723,10 @@ class ConfigManager:
             errors.append("Serial port must be specified")
         
         # Validate IP addresses
-        try:
-            import ipaddress
-            ipaddress.ip_address(config.network.local_ip)
-            ipaddress.ip_address(config.network.remote_ip)
-        except ValueError as e:
-            errors.append(f"Invalid IP address: {e}")
+        for ip in (config.network.local_ip, config.network.remote_ip):
+            if not _is_ip_address(ip):
+                errors.append(f"Invalid IP address: {ip!r} does not appear to be an IPv4 or IPv6 address")
+                break
         
         # Validate port ranges
         for port in config.services:
@@ -476,14 +734,26 @@ class ConfigManager:
                 errors.append(f"Invalid service port: {port}")
         
         # Validate proxy configuration
-        if config.proxy.enabled and config.proxy.type not in ['socks5', 'http']:
+        if config.proxy.enabled and config.proxy.type not in _PROXY_TYPES:
             errors.append(f"Invalid proxy type: {config.proxy.type}")
         
-        # Validate logging level
-        valid_levels = ['DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL']
-        if config.logging.level not in valid_levels:
+        # Validate logging levels (global and per component)
+        if str(config.logging.level).upper() not in _LEVEL_MAP:
             errors.append(f"Invalid log level: {config.logging.level}")
         
+        for component, level in config.logging.components.items():
+            if str(level).upper() not in _LEVEL_MAP:
+                errors.append(f"Invalid log level for component '{component}': {level}")
+        
+        # Validate size strings
+        for name, value in [('logging.file.max_size', config.logging.file.max_size),
+                            ('monitoring.packet_capture.max_file_size',
+                             config.monitoring.packet_capture.max_file_size)]:
+            try:
+                parse_size(value)
+            except ConfigurationError:
+                errors.append(f"Invalid {name}: {value}")
+        
         # Validate TCP configuration
         if config.tcp.initial_window_size <= 0:
             errors.append("TCP initial window size must be positive")
@@ -491,6 +761,9 @@ class ConfigManager:
         if config.tcp.mss <= 0:
             errors.append("TCP MSS must be positive")
         
+        if config.tcp.max_per_conn_buffer <= 0:
+            errors.append("TCP max_per_conn_buffer must be positive")
+        
         if errors:
             raise ConfigurationError("Configuration validation failed:\n" + 
                                    "\n".join(f"  - {error}" for error in errors))
@@ -501,6 +774,12 @@ class ConfigManager:
             raise ConfigurationError("Configuration not loaded. Call load_config() first.")
         return self.config
     
+    @staticmethod
+    def clear_parse_cache():
+        """Drop the in-memory parsed YAML and built Config caches"""
+        _load_yaml_cached.cache_clear()
+        _CONFIG_CACHE.clear()
+    
     def reload_config(self):
         """Reload configuration from file"""
         if self._config_file is None:
@@ -513,17 +792,26 @@ class ConfigManager:
             return None
         return self.config.services.get(port)
     
+    def _security_sets(self) -> Tuple[frozenset, frozenset]:
+        """Frozen allowed_ports/blocked_ips of the current config, built once per load"""
+        if self._security_sets_config is not self.config:
+            security = self.config.security
+            self._security_sets_cache = (frozenset(security.allowed_ports),
+                                         frozenset(security.blocked_ips))
+            self._security_sets_config = self.config
+        return self._security_sets_cache
+    
     def is_port_allowed(self, port: int) -> bool:
         """Check if a port is allowed by security configuration"""
         if self.config is None:
             return False
-        return port in self.config.security.allowed_ports
+        return port in self._security_sets()[0]
     
     def is_ip_blocked(self, ip: str) -> bool:
         """Check if an IP address is blocked"""
         if self.config is None:
             return False
-        return ip in self.config.security.blocked_ips
+        return ip in self._security_sets()[1]
 
 # Global configuration manager instance
 config_manager = ConfigManager()
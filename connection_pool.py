@@ -5,26 +5,89 @@ Provides efficient connection management, caching, and performance enhancements
 """
 
 import asyncio
-import time
+import functools
+import heapq
+import itertools
+import math
+import socket
 import weakref
+from array import array
 from collections import defaultdict, deque, OrderedDict
+from contextlib import asynccontextmanager
 from typing import Dict, Optional, Tuple, Any, Set, List
 from dataclasses import dataclass, field
-from enum import Enum, auto
-import statistics
 
 from safe_logger import get_safe_logger
+from compat import _SLOTS, _WEAKREF_SLOTS
 
 logger = get_safe_logger(__name__)
 
-class ConnectionState(Enum):
+# TCP keepalive tuning for pooled upstream connections (seconds / probes)
+_KEEPALIVE_IDLE = 60
+_KEEPALIVE_INTERVAL = 10
+_KEEPALIVE_COUNT = 5
+
+# Buffer pool size classes: powers of two up to 1 MiB, capped per class
+_MAX_SLAB_CLASS = 20
+_SLAB_CLASS_MAX_BUFFERS = 64
+
+# Most services tracked for response times (least recently recorded evicted)
+_RT_MAX_SERVICES = 1024
+
+def _set_keepalive_times(sock: socket.socket):
+    """Apply keepalive timings where the platform exposes them"""
+    for name, value in (('TCP_KEEPIDLE', _KEEPALIVE_IDLE),
+                        ('TCP_KEEPINTVL', _KEEPALIVE_INTERVAL),
+                        ('TCP_KEEPCNT', _KEEPALIVE_COUNT)):
+        opt = getattr(socket, name, None)
+        if opt is not None:
+            try:
+                sock.setsockopt(socket.IPPROTO_TCP, opt, value)
+            except OSError:
+                pass
+
+async def _open_tuned_connection(host: str, port: int) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+    """Connect with TCP_NODELAY and SO_KEEPALIVE set before the handshake"""
+    loop = asyncio.get_running_loop()
+    infos = await loop.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+    last_error: Optional[OSError] = None
+    
+    for family, type_, proto, _, address in infos:
+        sock = socket.socket(family, type_, proto)
+        try:
+            sock.setblocking(False)
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+            _set_keepalive_times(sock)
+            await loop.sock_connect(sock, address)
+        except OSError as e:
+            sock.close()
+            last_error = e
+            continue
+        except BaseException:
+            sock.close()
+            raise
+        return await asyncio.open_connection(sock=sock)
+    
+    raise last_error or OSError(f"No addresses found for {host}:{port}")
+
+@functools.lru_cache(maxsize=1024)
+def _intern_key(host: str, port: int) -> Tuple[str, int]:
+    """Shared (host, port) service key object"""
+    return (host, port)
+
+# Connection states; plain ints keep hot-path comparisons cheap
+IDLE, ACTIVE, CLOSING, CLOSED = 0, 1, 2, 3
+
+class ConnectionState:
     """Connection state for pooling"""
-    IDLE = auto()
-    ACTIVE = auto()
-    CLOSING = auto()
-    CLOSED = auto()
+    IDLE = IDLE
+    ACTIVE = ACTIVE
+    CLOSING = CLOSING
+    CLOSED = CLOSED
 
-@dataclass
+# Weakly referenced from the expiry heap, hence the weakref slot
+@dataclass(eq=False, **_WEAKREF_SLOTS)
 class PooledConnection:
     """Represents a pooled connection with metadata"""
     reader: asyncio.StreamReader
@@ -34,31 +97,43 @@ class PooledConnection:
     created_at: float
     last_used: float
     use_count: int = 0
-    state: ConnectionState = ConnectionState.IDLE
+    state: int = IDLE
     service_name: str = ""
+    service_key: Tuple[str, int] = field(init=False, repr=False)
+    # Deadline of this connection's live expiry heap entry (inf if none)
+    expiry_at: float = field(default=math.inf, init=False, repr=False)
+    
+    # created_at/last_used are event loop (monotonic) timestamps
     
     def __post_init__(self):
-        self.last_used = time.time()
+        self.service_key = _intern_key(self.host, self.port)
     
     @property
     def age(self) -> float:
         """Age of connection in seconds"""
-        return time.time() - self.created_at
+        return asyncio.get_running_loop().time() - self.created_at
     
     @property
     def idle_time(self) -> float:
         """Time since last use in seconds"""
-        return time.time() - self.last_used
+        return asyncio.get_running_loop().time() - self.last_used
     
-    def mark_used(self):
+    def mark_used(self, now: Optional[float] = None):
         """Mark connection as recently used"""
-        self.last_used = time.time()
+        self.last_used = asyncio.get_running_loop().time() if now is None else now
         self.use_count += 1
-        self.state = ConnectionState.ACTIVE
+        self.state = ACTIVE
     
     def mark_idle(self):
         """Mark connection as idle"""
-        self.state = ConnectionState.IDLE
+        self.state = IDLE
+    
+    def is_open(self) -> bool:
+        """Cheap synchronous liveness check (no I/O)"""
+        if self.writer.is_closing() or self.reader.at_eof():
+            return False
+        transport = self.writer.transport
+        return transport is not None and not transport.is_closing()
     
     async def is_alive(self) -> bool:
         """Check if connection is still alive"""
@@ -73,7 +148,7 @@ class PooledConnection:
         except:
             return False
 
-@dataclass
+@dataclass(**_SLOTS)
 class PoolStats:
     """Connection pool statistics"""
     total_connections: int = 0
@@ -91,6 +166,43 @@ class PoolStats:
         total = self.cache_hits + self.cache_misses
         return self.cache_hits / total if total > 0 else 0.0
 
+_MISSING = object()
+
+class _RingBuffer:
+    """Fixed-size ring of unboxed doubles; oldest samples are overwritten"""
+    
+    __slots__ = ('_data', '_size', '_index', '_count')
+    
+    def __init__(self, size: int):
+        self._data = array('d', bytes(8 * size))
+        self._size = size
+        self._index = 0
+        self._count = 0
+    
+    def add(self, value: float):
+        """Record a sample"""
+        self._data[self._index] = value
+        self._index += 1
+        if self._index == self._size:
+            self._index = 0
+        if self._count < self._size:
+            self._count += 1
+    
+    def view(self) -> array:
+        """Recorded samples (unordered)"""
+        if self._count == self._size:
+            return self._data
+        return self._data[:self._count]
+    
+    def mean(self) -> float:
+        return math.fsum(self.view()) / self._count if self._count else 0.0
+    
+    def max(self) -> float:
+        return max(self.view()) if self._count else 0.0
+    
+    def __len__(self) -> int:
+        return self._count
+
 class LRUCache:
     """Least Recently Used cache implementation"""
     
@@ -100,16 +212,16 @@ class LRUCache:
     
     def get(self, key: Any) -> Optional[Any]:
         """Get item from cache, marking it as recently used"""
-        if key in self._cache:
-            value = self._cache.pop(key)
-            self._cache[key] = value  # Move to end (most recent)
-            return value
-        return None
+        try:
+            self._cache.move_to_end(key)  # Most recent
+        except KeyError:
+            return None
+        return self._cache[key]
     
     def put(self, key: Any, value: Any):
         """Put item in cache, evicting LRU if necessary"""
         if key in self._cache:
-            self._cache.pop(key)
+            self._cache.move_to_end(key)
         elif len(self._cache) >= self.max_size:
             # Remove least recently used (first item)
             self._cache.popitem(last=False)
@@ -118,10 +230,7 @@ class LRUCache:
     
     def remove(self, key: Any) -> bool:
         """Remove item from cache"""
-        if key in self._cache:
-            self._cache.pop(key)
-            return True
-        return False
+        return self._cache.pop(key, _MISSING) is not _MISSING
     
     def clear(self):
         """Clear all cached items"""
@@ -130,6 +239,12 @@ class LRUCache:
     def size(self) -> int:
         """Get current cache size"""
         return len(self._cache)
+    
+    def __len__(self) -> int:
+        return len(self._cache)
+    
+    def __contains__(self, key: Any) -> bool:
+        return key in self._cache
 
 class ConnectionPool:
     """Efficient connection pool with LRU caching and health monitoring"""
@@ -137,32 +252,43 @@ class ConnectionPool:
     def __init__(self, max_connections: int = 100, 
                  idle_timeout: int = 300,
                  max_connection_age: int = 3600,
-                 health_check_interval: int = 60):
+                 health_check_interval: int = 60,
+                 max_idle_per_service: int = 10):
         self.max_connections = max_connections
         self.idle_timeout = idle_timeout
         self.max_connection_age = max_connection_age
         self.health_check_interval = health_check_interval
+        self.max_idle_per_service = max_idle_per_service
         
-        # Connection storage by service key (host, port)
-        self._connections: Dict[Tuple[str, int], List[PooledConnection]] = defaultdict(list)
-        self._cache = LRUCache(max_connections)
-        self._stats = PoolStats()
+        # All pooled connections by id(); state says whether active or idle
+        self._by_id: Dict[int, PooledConnection] = {}
+        self._service_counts: Dict[Tuple[str, int], int] = defaultdict(int)
+        self._created_at_sum = 0.0  # Sum of created_at over _by_id, for mean age
+        self._active_count = 0  # Connections in _by_id with state ACTIVE
         
-        # Active connections tracking
-        self._active_connections: Set[PooledConnection] = set()
+        # Idle connections per service key, reused LIFO (most recently returned first)
+        self._idle: Dict[Tuple[str, int], deque] = defaultdict(deque)
+        self._stats = PoolStats()
         
         # Connection limits per service
         self._per_service_limits: Dict[Tuple[str, int], int] = {}
         
+        # Per-service [lock, users] serializing connection creation on cache
+        # miss; an entry only exists while some caller holds or awaits it
+        self._creation_locks: Dict[Tuple[str, int], List[Any]] = {}
+        
+        # Min-heap of (deadline, tiebreak, weakref) for idle/age expiry
+        self._expiry_heap: List[Tuple[float, int, weakref.ref]] = []
+        self._expiry_counter = itertools.count()
+        self._expiry_changed = asyncio.Event()
+        
         # Health check task
         self._health_check_task: Optional[asyncio.Task] = None
         self._start_health_checks()
         
         # Metrics tracking
-        self._connection_times: deque = deque(maxlen=1000)
-        self._response_times: Dict[Tuple[str, int], deque] = defaultdict(
-            lambda: deque(maxlen=100)
-        )
+        self._connection_times = _RingBuffer(1000)
+        self._response_times: "OrderedDict[Tuple[str, int], _RingBuffer]" = OrderedDict()
     
     def set_service_limit(self, host: str, port: int, limit: int):
         """Set connection limit for a specific service"""
@@ -181,58 +307,97 @@ class ConnectionPool:
         Returns:
             PooledConnection if successful, None if failed
         """
-        service_key = (host, port)
-        start_time = time.time()
+        service_key = _intern_key(host, port)
+        loop = asyncio.get_running_loop()
+        start_time = loop.time()
         
         # Try to get cached connection first
-        cached_conn = self._get_cached_connection(service_key)
+        cached_conn = await self._reuse_cached_connection(service_key, service_name, start_time)
         if cached_conn:
-            if await cached_conn.is_alive():
-                cached_conn.mark_used()
+            return cached_conn
+        
+        # Serialize creation per service so concurrent misses don't stampede
+        entry = self._creation_locks.get(service_key)
+        if entry is None:
+            entry = self._creation_locks[service_key] = [asyncio.Lock(), 0]
+        entry[1] += 1
+        
+        try:
+            async with entry[0]:
+                # A connection may have been returned while waiting for the lock
+                cached_conn = await self._reuse_cached_connection(service_key, service_name, loop.time())
+                if cached_conn:
+                    return cached_conn
+                
+                self._stats.cache_misses += 1
+                
+                # Check connection limits
+                if not self._can_create_connection(service_key):
+                    logger.warning(f"Connection limit exceeded for {host}:{port}")
+                    return None
+                
+                return await self._create_connection(service_key, service_name, start_time)
+        finally:
+            # Drop the lock with its last user so unused services don't pile up
+            entry[1] -= 1
+            if not entry[1] and self._creation_locks.get(service_key) is entry:
+                del self._creation_locks[service_key]
+    
+    async def _reuse_cached_connection(self, service_key: Tuple[str, int], service_name: str,
+                                       now: float) -> Optional[PooledConnection]:
+        """Hand out an open idle connection for service, discarding dead ones"""
+        while True:
+            cached_conn = self._get_cached_connection(service_key)
+            if cached_conn is None:
+                return None
+            
+            if cached_conn.is_open():
+                cached_conn.mark_used(now)
+                self._active_count += 1
                 cached_conn.service_name = service_name
-                self._active_connections.add(cached_conn)
                 self._stats.cache_hits += 1
                 self._stats.connections_reused += 1
                 
-                logger.debug(f"Reusing cached connection to {host}:{port}")
+                logger.debug(f"Reusing cached connection to {cached_conn.host}:{cached_conn.port}")
                 return cached_conn
-            else:
-                # Remove dead connection
-                await self._remove_connection(cached_conn, service_key)
-        
-        self._stats.cache_misses += 1
-        
-        # Check connection limits
-        if not self._can_create_connection(service_key):
-            logger.warning(f"Connection limit exceeded for {host}:{port}")
-            return None
-        
-        # Create new connection
+            
+            # Remove dead connection
+            await self._remove_connection(cached_conn, service_key)
+    
+    async def _create_connection(self, service_key: Tuple[str, int], service_name: str,
+                                 start_time: float) -> Optional[PooledConnection]:
+        """Open and register a new connection"""
+        host, port = service_key
+        loop = asyncio.get_running_loop()
         try:
             logger.debug(f"Creating new connection to {host}:{port}")
-            reader, writer = await asyncio.open_connection(host, port)
+            reader, writer = await _open_tuned_connection(host, port)
+            now = loop.time()
             
             connection = PooledConnection(
                 reader=reader,
                 writer=writer,
                 host=host,
                 port=port,
-                created_at=time.time(),
-                last_used=time.time(),
+                created_at=now,
+                last_used=now,
                 service_name=service_name
             )
             
-            connection.mark_used()
-            self._active_connections.add(connection)
-            self._connections[service_key].append(connection)
+            connection.mark_used(now)
+            self._active_count += 1
+            self._by_id[id(connection)] = connection
+            self._service_counts[service_key] += 1
+            self._created_at_sum += now
+            self._schedule_expiry(connection)
             
             # Update statistics
             self._stats.connections_created += 1
             self._stats.total_connections += 1
             
             # Track connection creation time
-            connection_time = time.time() - start_time
-            self._connection_times.append(connection_time)
+            connection_time = now - start_time
+            self._connection_times.add(connection_time)
             
             logger.info(f"Created new connection to {host}:{port} in {connection_time:.3f}s")
             return connection
@@ -242,19 +407,15 @@ class ConnectionPool:
             return None
     
     def _get_cached_connection(self, service_key: Tuple[str, int]) -> Optional[PooledConnection]:
-        """Get cached connection for service"""
-        # Try cache first
-        cached = self._cache.get(service_key)
-        if cached and isinstance(cached, PooledConnection):
-            return cached
-        
-        # Try idle connections for this service
-        connections = self._connections.get(service_key, [])
-        for conn in connections:
-            if conn.state == ConnectionState.IDLE:
-                return conn
+        """Get the most recently returned idle connection for service"""
+        idle = self._idle.get(service_key)
+        if not idle:
+            return None
         
-        return None
+        conn = idle.pop()
+        if not idle:
+            del self._idle[service_key]
+        return conn
     
     def _can_create_connection(self, service_key: Tuple[str, int]) -> bool:
         """Check if we can create a new connection"""
@@ -265,51 +426,90 @@ class ConnectionPool:
         # Check per-service limit
         service_limit = self._per_service_limits.get(service_key)
         if service_limit is not None:
-            service_connections = len(self._connections.get(service_key, []))
-            if service_connections >= service_limit:
+            if self._service_counts.get(service_key, 0) >= service_limit:
                 return False
         
         return True
     
     async def return_connection(self, connection: PooledConnection):
         """Return a connection to the pool"""
-        if connection not in self._active_connections:
+        if (self._by_id.get(id(connection)) is not connection or
+                connection.state != ACTIVE):
             logger.warning("Attempting to return unknown connection")
             return
         
-        self._active_connections.discard(connection)
-        
-        # Check if connection is still alive
-        if await connection.is_alive():
-            connection.mark_idle()
-            service_key = (connection.host, connection.port)
-            self._cache.put(service_key, connection)
-            logger.debug(f"Returned connection to pool: {connection.host}:{connection.port}")
+        # Check if connection is still open
+        if connection.is_open():
+            await self._release(connection)
         else:
             # Connection is dead, remove it
-            await self._remove_connection(connection, (connection.host, connection.port))
+            await self._remove_connection(connection, connection.service_key)
+    
+    async def _release(self, connection: PooledConnection):
+        """Put an active connection back on its service's idle deque"""
+        connection.mark_idle()
+        self._active_count -= 1
+        idle = self._idle[connection.service_key]
+        idle.append(connection)
+        self._schedule_expiry(connection)
+        logger.debug(f"Returned connection to pool: {connection.host}:{connection.port}")
+        
+        # Bound idle sockets per service; close the longest-idle surplus
+        if len(idle) > self.max_idle_per_service:
+            await self._remove_connection(idle[0], connection.service_key)
+    
+    @asynccontextmanager
+    async def acquire(self, host: str, port: int, service_name: str = ""):
+        """
+        Borrow a connection for the duration of an ``async with`` block
+        
+        Yields the PooledConnection, or None if one could not be obtained.
+        On normal exit the connection goes straight back to the idle pool
+        (a dead one is caught on the next acquire); if the block raises,
+        the connection is closed instead.
+        """
+        connection = await self.get_connection(host, port, service_name)
+        try:
+            yield connection
+        except BaseException:
+            if connection is not None:
+                await self.close_connection(connection)
+            raise
+        if (connection is not None and connection.state == ACTIVE and
+                self._by_id.get(id(connection)) is connection):
+            await self._release(connection)
     
     async def close_connection(self, connection: PooledConnection):
         """Close and remove a connection from the pool"""
-        service_key = (connection.host, connection.port)
-        await self._remove_connection(connection, service_key)
+        await self._remove_connection(connection, connection.service_key)
     
     async def _remove_connection(self, connection: PooledConnection, 
                                service_key: Tuple[str, int]):
         """Remove connection from all tracking structures"""
-        self._active_connections.discard(connection)
-        
-        # Remove from connections list
-        if service_key in self._connections:
-            try:
-                self._connections[service_key].remove(connection)
-                if not self._connections[service_key]:
-                    del self._connections[service_key]
-            except ValueError:
-                pass  # Connection not in list
-        
-        # Remove from cache
-        self._cache.remove(service_key)
+        tracked = self._by_id.pop(id(connection), None) is connection
+        if tracked:
+            count = self._service_counts[service_key] - 1
+            if count > 0:
+                self._service_counts[service_key] = count
+            else:
+                del self._service_counts[service_key]
+            self._created_at_sum = (self._created_at_sum - connection.created_at
+                                    if self._by_id else 0.0)
+            if connection.state == ACTIVE:
+                self._active_count -= 1
+        
+        # Remove from idle connections; expired idle conns are usually the oldest
+        idle = self._idle.get(service_key)
+        if idle and connection.state == IDLE:
+            if idle[0] is connection:
+                idle.popleft()
+            else:
+                try:
+                    idle.remove(connection)
+                except ValueError:
+                    pass  # Connection not idle
+            if not idle:
+                del self._idle[service_key]
         
         # Close the connection
         if not connection.writer.is_closing():
@@ -320,18 +520,45 @@ class ConnectionPool:
                 pass  # Ignore cleanup errors
         
         # Update statistics
-        self._stats.connections_closed += 1
-        self._stats.total_connections = max(0, self._stats.total_connections - 1)
+        if tracked:
+            self._stats.connections_closed += 1
+            self._stats.total_connections = max(0, self._stats.total_connections - 1)
         
         logger.debug(f"Removed connection: {connection.host}:{connection.port}")
     
+    def _expiry_deadline(self, connection: PooledConnection) -> float:
+        """Time at which connection should be closed in its current state"""
+        deadline = connection.created_at + self.max_connection_age
+        if connection.state == IDLE:
+            deadline = min(deadline, connection.last_used + self.idle_timeout)
+        return deadline
+    
+    def _schedule_expiry(self, connection: PooledConnection):
+        """Push connection's current deadline onto the expiry heap"""
+        deadline = self._expiry_deadline(connection)
+        if connection.expiry_at <= deadline:
+            return  # An entry at or before deadline exists; it re-checks when due
+        connection.expiry_at = deadline
+        entry = (deadline, next(self._expiry_counter), weakref.ref(connection))
+        heapq.heappush(self._expiry_heap, entry)
+        if self._expiry_heap[0] is entry:
+            self._expiry_changed.set()  # Wake health loop for earlier deadline
+    
     def _start_health_checks(self):
         """Start background health check task"""
         async def health_check_loop():
+            loop = asyncio.get_running_loop()
             while True:
                 try:
                     await self._perform_health_checks()
-                    await asyncio.sleep(self.health_check_interval)
+                    delay = self.health_check_interval
+                    if self._expiry_heap:
+                        delay = min(delay, max(0.0, self._expiry_heap[0][0] - loop.time()))
+                    self._expiry_changed.clear()
+                    try:
+                        await asyncio.wait_for(self._expiry_changed.wait(), delay)
+                    except asyncio.TimeoutError:
+                        pass
                 except asyncio.CancelledError:
                     break
                 except Exception as e:
@@ -341,48 +568,54 @@ class ConnectionPool:
         self._health_check_task = asyncio.create_task(health_check_loop())
     
     async def _perform_health_checks(self):
-        """Perform health checks and cleanup"""
-        current_time = time.time()
-        connections_to_remove = []
-        
-        # Check all connections
-        for service_key, connections in self._connections.items():
-            for conn in connections[:]:  # Create copy to avoid modification during iteration
-                should_remove = False
-                
-                # Check idle timeout
-                if (conn.state == ConnectionState.IDLE and 
-                    conn.idle_time > self.idle_timeout):
-                    should_remove = True
-                    logger.debug(f"Connection idle timeout: {service_key}")
-                
-                # Check max age
-                elif conn.age > self.max_connection_age:
-                    should_remove = True
-                    logger.debug(f"Connection age timeout: {service_key}")
-                
-                # Check if connection is alive
-                elif not await conn.is_alive():
-                    should_remove = True
-                    logger.debug(f"Connection health check failed: {service_key}")
-                
-                if should_remove:
-                    connections_to_remove.append((conn, service_key))
-        
-        # Remove unhealthy connections
-        for conn, service_key in connections_to_remove:
-            await self._remove_connection(conn, service_key)
-        
-        # Update statistics
-        self._update_stats()
+        """Close connections whose idle or age deadline has passed"""
+        current_time = asyncio.get_running_loop().time()
+        heap = self._expiry_heap
+        connections_to_remove: Set[PooledConnection] = set()
+        
+        while heap and heap[0][0] <= current_time:
+            deadline, _, conn_ref = heapq.heappop(heap)
+            conn = conn_ref()
+            if conn is None or conn in connections_to_remove:
+                continue
+            
+            # Lazy deletion: skip entries for closed connections and entries
+            # superseded by an earlier deadline
+            if self._by_id.get(id(conn)) is not conn or deadline != conn.expiry_at:
+                continue
+            conn.expiry_at = math.inf
+            
+            # Re-used since the entry was pushed: schedule its new deadline
+            if self._expiry_deadline(conn) > current_time:
+                self._schedule_expiry(conn)
+                continue
+            
+            service_key = conn.service_key
+            if conn.state == IDLE and current_time - conn.last_used > self.idle_timeout:
+                logger.debug(f"Connection idle timeout: {service_key}")
+            else:
+                logger.debug(f"Connection age timeout: {service_key}")
+            connections_to_remove.add(conn)
         
+        # Remove expired connections, closing them concurrently
         if connections_to_remove:
+            expired = list(connections_to_remove)
+            results = await asyncio.gather(*(
+                self._remove_connection(conn, conn.service_key)
+                for conn in expired
+            ), return_exceptions=True)
+            for conn, result in zip(expired, results):
+                if isinstance(result, Exception):
+                    logger.warning(f"Failed to close expired connection "
+                                   f"{conn.host}:{conn.port}: {result}")
+            
+            self._update_stats()
             logger.info(f"Health check completed, removed {len(connections_to_remove)} connections")
     
     def _update_stats(self):
         """Update pool statistics"""
-        total_connections = sum(len(conns) for conns in self._connections.values())
-        active_connections = len(self._active_connections)
+        total_connections = len(self._by_id)
+        active_connections = self._active_count
         idle_connections = total_connections - active_connections
         
         self._stats.total_connections = total_connections
@@ -391,10 +624,8 @@ class ConnectionPool:
         
         # Calculate average connection age
         if total_connections > 0:
-            ages = []
-            for connections in self._connections.values():
-                ages.extend(conn.age for conn in connections)
-            self._stats.average_connection_age = statistics.mean(ages)
+            now = asyncio.get_running_loop().time()
+            self._stats.average_connection_age = now - self._created_at_sum / total_connections
     
     def get_stats(self) -> PoolStats:
         """Get current pool statistics"""
@@ -403,14 +634,15 @@ class ConnectionPool:
     
     def get_connection_metrics(self) -> Dict[str, Any]:
         """Get detailed connection metrics"""
+        self._update_stats()
         metrics = {
             'total_connections': self._stats.total_connections,
             'active_connections': self._stats.active_connections,
             'idle_connections': self._stats.idle_connections,
             'cache_hit_rate': self._stats.hit_rate(),
             'connections_per_service': {
-                f"{host}:{port}": len(conns) 
-                for (host, port), conns in self._connections.items()
+                f"{host}:{port}": count
+                for (host, port), count in self._service_counts.items()
             },
             'average_connection_time': 0.0,
             'average_response_times': {}
@@ -418,20 +650,27 @@ class ConnectionPool:
         
         # Calculate average connection time
         if self._connection_times:
-            metrics['average_connection_time'] = statistics.mean(self._connection_times)
+            metrics['average_connection_time'] = self._connection_times.mean()
         
         # Calculate average response times per service
         for service_key, times in self._response_times.items():
             if times:
                 host, port = service_key
-                metrics['average_response_times'][f"{host}:{port}"] = statistics.mean(times)
+                metrics['average_response_times'][f"{host}:{port}"] = times.mean()
         
         return metrics
     
     def record_response_time(self, host: str, port: int, response_time: float):
         """Record response time for a service"""
-        service_key = (host, port)
-        self._response_times[service_key].append(response_time)
+        service_key = _intern_key(host, port)
+        times = self._response_times.get(service_key)
+        if times is None:
+            if len(self._response_times) >= _RT_MAX_SERVICES:
+                self._response_times.popitem(last=False)
+            times = self._response_times[service_key] = _RingBuffer(100)
+        else:
+            self._response_times.move_to_end(service_key)
+        times.add(response_time)
     
     async def warmup_connections(self, services: List[Tuple[str, int, str]], 
                                connections_per_service: int = 2):
@@ -444,29 +683,36 @@ class ConnectionPool:
         """
         logger.info(f"Warming up connection pool for {len(services)} services")
         
-        warmup_tasks = []
-        for host, port, service_name in services:
-            for _ in range(connections_per_service):
-                task = asyncio.create_task(
-                    self._create_warmup_connection(host, port, service_name)
-                )
-                warmup_tasks.append(task)
-        
-        # Wait for all warmup connections
-        results = await asyncio.gather(*warmup_tasks, return_exceptions=True)
+        results = await asyncio.gather(*(
+            self._warmup_service(host, port, service_name, connections_per_service)
+            for host, port, service_name in services
+        ), return_exceptions=True)
         
-        successful = sum(1 for r in results if not isinstance(r, Exception))
-        logger.info(f"Warmup completed: {successful}/{len(warmup_tasks)} connections created")
+        successful = sum(r for r in results if not isinstance(r, BaseException))
+        total = len(services) * connections_per_service
+        logger.info(f"Warmup completed: {successful}/{total} connections created")
     
-    async def _create_warmup_connection(self, host: str, port: int, service_name: str):
-        """Create a single warmup connection"""
+    async def _warmup_service(self, host: str, port: int, service_name: str,
+                              count: int) -> int:
+        """Create up to count connections for one service and return them idle"""
+        acquired = []
         try:
-            conn = await self.get_connection(host, port, service_name)
-            if conn:
+            for _ in range(count):
+                try:
+                    conn = await self.get_connection(host, port, service_name)
+                except Exception as e:
+                    logger.warning(f"Failed to warm up connection to {host}:{port}: {e}")
+                    break
+                if conn is None:
+                    break
+                acquired.append(conn)
+        finally:
+            # Hold every connection until all are made so none is reused mid-warmup
+            for conn in acquired:
                 await self.return_connection(conn)
-                logger.debug(f"Warmed up connection to {host}:{port}")
-        except Exception as e:
-            logger.warning(f"Failed to warm up connection to {host}:{port}: {e}")
+        
+        logger.debug(f"Warmed up {len(acquired)} connections to {host}:{port}")
+        return len(acquired)
     
     async def shutdown(self):
         """Shutdown the connection pool and close all connections"""
@@ -481,13 +727,8 @@ class ConnectionPool:
                 pass
         
         # Close all connections
-        all_connections = []
-        for connections in self._connections.values():
-            all_connections.extend(connections)
-        all_connections.extend(self._active_connections)
-        
         close_tasks = []
-        for conn in all_connections:
+        for conn in self._by_id.values():
             if not conn.writer.is_closing():
                 conn.writer.close()
                 close_tasks.append(conn.writer.wait_closed())
@@ -496,9 +737,13 @@ class ConnectionPool:
             await asyncio.gather(*close_tasks, return_exceptions=True)
         
         # Clear all data structures
-        self._connections.clear()
-        self._cache.clear()
-        self._active_connections.clear()
+        self._by_id.clear()
+        self._service_counts.clear()
+        self._created_at_sum = 0.0
+        self._active_count = 0
+        self._idle.clear()
+        self._creation_locks.clear()
+        self._expiry_heap.clear()
         
         logger.info("Connection pool shutdown complete")
 
@@ -509,61 +754,62 @@ class PerformanceMonitor:
         self.sample_size = sample_size
         
         # Performance metrics
-        self._cpu_times: deque = deque(maxlen=sample_size)
-        self._memory_usage: deque = deque(maxlen=sample_size)
-        self._packet_processing_times: deque = deque(maxlen=sample_size)
-        self._throughput_samples: deque = deque(maxlen=sample_size)
+        self._cpu_times = _RingBuffer(sample_size)
+        self._memory_usage = _RingBuffer(sample_size)
+        self._packet_processing_times = _RingBuffer(sample_size)
+        self._throughput_samples = _RingBuffer(sample_size)
         
         # Connection metrics
-        self._connection_latencies: deque = deque(maxlen=sample_size)
-        self._error_rates: deque = deque(maxlen=sample_size)
+        self._connection_latencies = _RingBuffer(sample_size)
+        self._error_rates = _RingBuffer(sample_size)
         
         # Buffer management
-        self._buffer_pool = asyncio.Queue(maxsize=100)
+        self._slabs: List[deque] = [deque() for _ in range(_MAX_SLAB_CLASS + 1)]
         self._initialize_buffer_pool()
     
     def _initialize_buffer_pool(self):
         """Pre-allocate buffers for zero-copy operations"""
+        slab = self._slabs[13]
         for _ in range(50):  # Start with 50 buffers
-            buffer = bytearray(8192)  # 8KB buffers
-            self._buffer_pool.put_nowait(buffer)
+            slab.append(bytearray(8192))  # 8KB buffers
+    
+    def _buffer_pool_size(self) -> int:
+        return sum(len(slab) for slab in self._slabs)
     
     async def get_buffer(self, size: int = 8192) -> bytearray:
-        """Get a buffer from the pool or create new one"""
-        try:
-            buffer = self._buffer_pool.get_nowait()
-            if len(buffer) >= size:
-                return buffer
-        except asyncio.QueueEmpty:
-            pass
+        """Get a buffer of at least size bytes from its power-of-two size class"""
+        k = (size - 1).bit_length() if size > 1 else 0
+        if k > _MAX_SLAB_CLASS:
+            return bytearray(size)  # Too large to pool
         
-        # Create new buffer if pool is empty or buffer too small
-        return bytearray(size)
+        slab = self._slabs[k]
+        return slab.pop() if slab else bytearray(1 << k)
     
     async def return_buffer(self, buffer: bytearray):
-        """Return a buffer to the pool"""
-        try:
-            # Clear the buffer and return to pool
-            buffer[:] = b'\x00' * len(buffer)
-            self._buffer_pool.put_nowait(buffer)
-        except asyncio.QueueFull:
-            pass  # Pool is full, let garbage collector handle it
+        """Return a buffer to the pool (contents are not cleared)"""
+        # Largest class the buffer can fully serve
+        k = len(buffer).bit_length() - 1
+        if 0 <= k <= _MAX_SLAB_CLASS:
+            slab = self._slabs[k]
+            if len(slab) < _SLAB_CLASS_MAX_BUFFERS:
+                slab.append(buffer)
+        # Otherwise pool is full or buffer unpoolable, let garbage collector handle it
     
     def record_packet_processing_time(self, processing_time: float):
         """Record packet processing time"""
-        self._packet_processing_times.append(processing_time)
+        self._packet_processing_times.add(processing_time)
     
     def record_connection_latency(self, latency: float):
         """Record connection establishment latency"""
-        self._connection_latencies.append(latency)
+        self._connection_latencies.add(latency)
     
     def record_throughput(self, bytes_per_second: float):
         """Record throughput measurement"""
-        self._throughput_samples.append(bytes_per_second)
+        self._throughput_samples.add(bytes_per_second)
     
     def record_error_rate(self, error_rate: float):
         """Record error rate (0.0 to 1.0)"""
-        self._error_rates.append(error_rate)
+        self._error_rates.add(error_rate)
     
     def get_performance_metrics(self) -> Dict[str, Any]:
         """Get current performance metrics"""
@@ -571,43 +817,39 @@ class PerformanceMonitor:
         
         # Packet processing performance
         if self._packet_processing_times:
-            metrics['avg_packet_processing_time'] = statistics.mean(
-                self._packet_processing_times
-            )
+            metrics['avg_packet_processing_time'] = self._packet_processing_times.mean()
             metrics['p95_packet_processing_time'] = self._percentile(
                 self._packet_processing_times, 95
             )
         
         # Connection performance
         if self._connection_latencies:
-            metrics['avg_connection_latency'] = statistics.mean(
-                self._connection_latencies
-            )
+            metrics['avg_connection_latency'] = self._connection_latencies.mean()
             metrics['p95_connection_latency'] = self._percentile(
                 self._connection_latencies, 95
             )
         
         # Throughput
         if self._throughput_samples:
-            metrics['avg_throughput_bps'] = statistics.mean(self._throughput_samples)
-            metrics['max_throughput_bps'] = max(self._throughput_samples)
+            metrics['avg_throughput_bps'] = self._throughput_samples.mean()
+            metrics['max_throughput_bps'] = self._throughput_samples.max()
         
         # Error rates
         if self._error_rates:
-            metrics['avg_error_rate'] = statistics.mean(self._error_rates)
-            metrics['max_error_rate'] = max(self._error_rates)
+            metrics['avg_error_rate'] = self._error_rates.mean()
+            metrics['max_error_rate'] = self._error_rates.max()
         
         # Buffer pool status
-        metrics['buffer_pool_size'] = self._buffer_pool.qsize()
+        metrics['buffer_pool_size'] = self._buffer_pool_size()
         
         return metrics
     
-    def _percentile(self, data: deque, percentile: float) -> float:
+    def _percentile(self, data: _RingBuffer, percentile: float) -> float:
         """Calculate percentile of data"""
         if not data:
             return 0.0
         
-        sorted_data = sorted(data)
+        sorted_data = sorted(data.view())
         index = int(len(sorted_data) * (percentile / 100.0))
         index = min(index, len(sorted_data) - 1)
         return sorted_data[index]
@@ -617,7 +859,7 @@ class PerformanceMonitor:
         recommendations = {}
         
         if self._packet_processing_times:
-            avg_time = statistics.mean(self._packet_processing_times)
+            avg_time = self._packet_processing_times.mean()
             
             if avg_time > 0.001:  # 1ms
                 recommendations['buffer_optimization'] = (
@@ -629,7 +871,7 @@ class PerformanceMonitor:
                 )
         
         # Buffer pool recommendations
-        current_pool_size = self._buffer_pool.qsize()
+        current_pool_size = self._buffer_pool_size()
         if current_pool_size < 10:
             recommendations['buffer_pool'] = (
                 "Consider increasing buffer pool size"
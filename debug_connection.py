@@ -12,6 +12,10 @@ from safe_logger import get_safe_logger
 
 logger = get_safe_logger(__name__)
 
+async def _read_lines(reader, count):
+    """Read count lines in order (StreamReader allows one reader at a time)"""
+    return [await reader.readline() for _ in range(count)]
+
 async def test_direct_echo_connection():
     """Test direct connection to echo server to isolate the issue"""
     try:
@@ -19,32 +23,16 @@ async def test_direct_echo_connection():
         reader, writer = await asyncio.open_connection('127.0.0.1', 8888)
         print("✓ Connected directly to echo server")
         
-        # Test 1: Single message
-        msg1 = b"Hello Direct\n"
-        writer.write(msg1)
-        await writer.drain()
-        print(f"→ Sent: {msg1.decode().strip()}")
-        
-        response1 = await asyncio.wait_for(reader.readline(), timeout=5)
-        print(f"← Received: {response1.decode().strip()}")
-        
-        # Test 2: Second message immediately 
-        msg2 = b"Message 2\n"
-        writer.write(msg2)
-        await writer.drain()
-        print(f"→ Sent: {msg2.decode().strip()}")
-        
-        response2 = await asyncio.wait_for(reader.readline(), timeout=5)
-        print(f"← Received: {response2.decode().strip()}")
-        
-        # Test 3: Third message
-        msg3 = b"Message 3\n"
-        writer.write(msg3)
+        # Pipeline three messages in one write, then read all three echoes
+        messages = [b"Hello Direct\n", b"Message 2\n", b"Message 3\n"]
+        writer.write(b"".join(messages))
         await writer.drain()
-        print(f"→ Sent: {msg3.decode().strip()}")
+        for msg in messages:
+            print(f"→ Sent: {msg.decode().strip()}")
         
-        response3 = await asyncio.wait_for(reader.readline(), timeout=5)
-        print(f"← Received: {response3.decode().strip()}")
+        responses = await asyncio.wait_for(_read_lines(reader, len(messages)), timeout=5)
+        for response in responses:
+            print(f"← Received: {response.decode().strip()}")
         
         print("✓ Direct connection test passed - echo server works correctly")
         
@@ -69,7 +57,8 @@ async def test_through_pyslirp():
         reader, writer = await asyncio.open_connection('127.0.0.1', 8888)
         print("✓ Connected through PyLiRP forwarder")
         
-        # Test single message
+        # Test single message. Not pipelined: the second message must go
+        # out only after the first reply, which is the path under test
         msg = b"Hello PyLiRP\n"
         writer.write(msg)
         await writer.drain()
@@ -79,7 +68,7 @@ async def test_through_pyslirp():
         print(f"← Received: {response.decode().strip()}")
         
         # Check if connection is still alive by sending another message
-        msg2 = b"Second message\n" 
+        msg2 = b"Second message\n"
         writer.write(msg2)
         await writer.drain()
         print(f"→ Sent: {msg2.decode().strip()}")
@@ -9,150 +9,251 @@ where the SSH connection is breaking down.
 import struct
 import socket
 import logging
-from typing import Dict, Any
+from contextvars import ContextVar
+from typing import Dict, Any, List, Tuple
 
 logger = logging.getLogger(__name__)
 
+# SSH binary packets start with a 4-byte big-endian length field
+_SSH_LEN_STRUCT = struct.Struct('!I')
+
+# Leading TCP header fields: ports, seq, ack, data offset byte, flags byte
+_TCP_HDR = struct.Struct('!HHIIBB')
+
+# Batch record: src_port, dst_port, flags, seq, ack, data_len
+_BATCH_REC = struct.Struct('!HHBIII')
+
+# Byte classes for the ASCII content probe: printable ASCII, and non-ASCII
+# bytes (which the probe ignores, as decode('ascii', errors='ignore') did)
+_PRINTABLE_ASCII = bytes(range(0x20, 0x7f))
+_NON_ASCII = bytes(range(0x80, 0x100))
+_PRINTABLE_OR_NON_ASCII = _PRINTABLE_ASCII + _NON_ASCII
+
+# Payload kinds from TCPFlowDebugger._classify
+_PAYLOAD_OTHER, _PAYLOAD_SSH_VERSION, _PAYLOAD_SSH_BINARY = 0, 1, 2
+
+# SSH data packets kept for the report (the earliest ones, where handshake
+# problems show up); later packets are only counted
+_SSH_PACKET_HISTORY = 64
+
+# Comma-joined TCP flag names indexed by the low six flag bits
+_FLAG_NAMES = tuple(
+    ','.join(name for bit, name in ((0x01, "FIN"), (0x02, "SYN"), (0x04, "RST"),
+                                    (0x08, "PSH"), (0x10, "ACK"), (0x20, "URG"))
+             if i & bit)
+    for i in range(64)
+)
+
+class _LazyHex:
+    """Hex of a payload prefix, rendered only if the log record is emitted"""
+    __slots__ = ('mv', 'n')
+    
+    def __init__(self, data: bytes, n: int):
+        self.mv = memoryview(data)
+        self.n = n
+    
+    def __str__(self) -> str:
+        return self.mv[:self.n].hex()
+
 class TCPFlowDebugger:
     """Debug TCP flow at packet level"""
     
-    def __init__(self):
+    # Per-segment state is touched on every call; slots keep attribute access cheap
+    __slots__ = ('capture_payload', '_ssh_only', 'packets_seen', 'data_packets',
+                 'ssh_data_count', 'ssh_handshake_packets', 'ssh_data_packets',
+                 'ssh_payloads')
+    
+    def __init__(self, capture_payload: bool = False):
+        self.capture_payload = capture_payload  # Keep first 100 bytes of SSH data
+        self._ssh_only = True  # Only analyze segments to/from port 22
         self.packets_seen = 0
         self.data_packets = 0
+        self.ssh_data_count = 0
         self.ssh_handshake_packets = []
-        self.ssh_data_packets = []
+        # (direction, seq, ack, data_len) per SSH data packet, up to _SSH_PACKET_HISTORY
+        self.ssh_data_packets: List[Tuple[str, int, int, int]] = []
+        self.ssh_payloads: List[bytes] = []
         
+    def set_filter(self, ssh_only: bool = True):
+        """Restrict analysis to SSH (port 22) segments, or trace every segment"""
+        self._ssh_only = ssh_only
+    
     def analyze_tcp_segment(self, packet_info: Dict[str, Any], data: bytes = b''):
         """Analyze individual TCP segment in detail"""
+        self._analyze(packet_info.get('src_port', 0), packet_info.get('dst_port', 0),
+                      packet_info.get('flags', 0), packet_info.get('seq', 0),
+                      packet_info.get('ack', 0), data)
+    
+    def analyze_tcp_header(self, hdr: bytes, data: bytes = b''):
+        """Analyze a segment given its raw TCP header (at least 14 bytes)"""
+        src_port, dst_port, seq, ack, _, flags = _TCP_HDR.unpack_from(hdr)
+        self._analyze(src_port, dst_port, flags, seq, ack, data)
+    
+    def analyze_tcp_batch(self, records: bytes, payloads: bytes = b''):
+        """
+        Analyze many segments in one call
+        
+        records holds back-to-back _BATCH_REC entries; payloads holds each
+        segment's data concatenated in the same order.
+        """
+        view = memoryview(payloads)
+        offset = 0
+        for src_port, dst_port, flags, seq, ack, data_len in _BATCH_REC.iter_unpack(records):
+            data = view[offset:offset + data_len].tobytes() if data_len else b''
+            offset += data_len
+            self._analyze(src_port, dst_port, flags, seq, ack, data)
+    
+    def _analyze(self, src_port: int, dst_port: int, flags: int,
+                 seq: int, ack: int, data: bytes):
         self.packets_seen += 1
+        if data:
+            self.data_packets += 1
         
-        src_port = packet_info.get('src_port', 0)
-        dst_port = packet_info.get('dst_port', 0) 
-        flags = packet_info.get('flags', 0)
-        seq = packet_info.get('seq', 0)
-        ack = packet_info.get('ack', 0)
+        is_ssh = dst_port == 22 or src_port == 22
+        if self._ssh_only and not is_ssh:
+            return
         
-        # Decode flags
-        flag_names = []
-        if flags & 0x01: flag_names.append("FIN")
-        if flags & 0x02: flag_names.append("SYN") 
-        if flags & 0x04: flag_names.append("RST")
-        if flags & 0x08: flag_names.append("PSH")
-        if flags & 0x10: flag_names.append("ACK")
-        if flags & 0x20: flag_names.append("URG")
+        # With INFO filtered out only the counters used by the report are kept
+        enabled = logger.isEnabledFor(logging.INFO)
+        if enabled:
+            logger.info("TCP SEGMENT #%d: %s->%s flags=[%s] seq=%s ack=%s data_len=%d",
+                        self.packets_seen, src_port, dst_port,
+                        _FLAG_NAMES[flags & 0x3F], seq, ack, len(data))
         
-        logger.info(f"TCP SEGMENT #{self.packets_seen}: {src_port}->{dst_port} "
-                   f"flags=[{','.join(flag_names)}] seq={seq} ack={ack} "
-                   f"data_len={len(data)}")
+        # Classify the payload once for both analyzers (only needed for logging)
+        kind, packet_len = self._classify(data) if enabled and data else (_PAYLOAD_OTHER, 0)
         
         # Analyze SSH-specific traffic
-        if dst_port == 22 or src_port == 22:
-            self._analyze_ssh_packet(src_port, dst_port, flags, seq, ack, data)
+        if is_ssh:
+            self._analyze_ssh_packet(src_port, dst_port, flags, seq, ack, data,
+                                     kind, packet_len, enabled)
         
         # Log data content for debugging
-        if data:
-            self.data_packets += 1
-            logger.info(f"  DATA: {len(data)} bytes")
-            self._analyze_data_content(data)
+        if data and enabled:
+            logger.info("  DATA: %d bytes", len(data))
+            self._analyze_data_content(data, kind, packet_len)
             
+    def _classify(self, data: bytes) -> Tuple[int, int]:
+        """Payload kind and SSH packet length (0 unless an SSH binary packet)"""
+        # Dispatch on the first byte: version lines start with 'S', and any
+        # plausible binary packet length (<= 35000) has a zero high byte
+        first = data[0]
+        if first == 0x53:
+            if data.startswith(b'SSH-'):
+                return _PAYLOAD_SSH_VERSION, 0
+        elif first == 0:
+            packet_len = self._ssh_binary_length(data)
+            if packet_len:
+                return _PAYLOAD_SSH_BINARY, packet_len
+        return _PAYLOAD_OTHER, 0
+    
     def _analyze_ssh_packet(self, src_port: int, dst_port: int, flags: int, 
-                           seq: int, ack: int, data: bytes):
-        """Analyze SSH-specific packets"""
+                           seq: int, ack: int, data: bytes,
+                           kind: int, packet_len: int, enabled: bool):
+        """Analyze SSH-specific packets; logs only when enabled (INFO on)"""
         direction = "CLIENT->SSH" if dst_port == 22 else "SSH->CLIENT"
         
         if data:
-            self.ssh_data_packets.append({
-                'direction': direction,
-                'seq': seq,
-                'ack': ack,
-                'data_len': len(data),
-                'data': data[:100]  # First 100 bytes for analysis
-            })
-            
-            logger.info(f"  SSH {direction}: {len(data)} bytes of data")
+            self.ssh_data_count += 1
+            if len(self.ssh_data_packets) < _SSH_PACKET_HISTORY:
+                self.ssh_data_packets.append((direction, seq, ack, len(data)))
+                if self.capture_payload:
+                    self.ssh_payloads.append(data[:100])  # First 100 bytes for analysis
+        
+        if not enabled:
+            return
+        
+        if data:
+            logger.info("  SSH %s: %d bytes of data", direction, len(data))
             
             # Try to identify SSH protocol stages
             if len(data) > 4:
-                if data.startswith(b'SSH-'):
-                    logger.info(f"    SSH Version Exchange: {data[:50]}")
-                elif self._is_ssh_binary_packet(data):
-                    logger.info(f"    SSH Binary Packet: packet_len={self._get_ssh_packet_length(data)}")
+                if kind == _PAYLOAD_SSH_VERSION:
+                    logger.info("    SSH Version Exchange: %s", data[:50])
+                elif kind == _PAYLOAD_SSH_BINARY:
+                    logger.info("    SSH Binary Packet: packet_len=%d", packet_len)
                 else:
-                    logger.info(f"    SSH Data: {data[:20].hex()} ...")
+                    logger.info("    SSH Data: %s ...", _LazyHex(data, 20))
         else:
-            logger.info(f"  SSH {direction}: Control packet (no data)")
-            
-    def _analyze_data_content(self, data: bytes):
-        """Analyze the content of data packets"""
-        if not data:
-            return
+            logger.info("  SSH %s: Control packet (no data)", direction)
             
+    def _analyze_data_content(self, data: bytes, kind: int, packet_len: int):
+        """Analyze the content of data packets (caller checks INFO is enabled)"""
         # Check if it's printable ASCII (like SSH version string)
-        try:
-            ascii_data = data.decode('ascii', errors='ignore')
-            if ascii_data.isprintable() and len(ascii_data) > 4:
-                logger.info(f"    ASCII Content: {ascii_data[:50]}")
+        if not data.translate(None, _PRINTABLE_OR_NON_ASCII):
+            ascii_data = data.translate(None, _NON_ASCII)
+            if len(ascii_data) > 4:
+                logger.info("    ASCII Content: %s", ascii_data[:50].decode('ascii'))
                 return
-        except:
-            pass
             
         # Check for SSH protocol markers
-        if data.startswith(b'SSH-'):
-            logger.info(f"    SSH Version String: {data[:50]}")
-        elif self._is_ssh_binary_packet(data):
-            packet_len = self._get_ssh_packet_length(data)
-            logger.info(f"    SSH Binary Packet: length={packet_len}")
+        if kind == _PAYLOAD_SSH_VERSION:
+            logger.info("    SSH Version String: %s", data[:50])
+        elif kind == _PAYLOAD_SSH_BINARY:
+            logger.info("    SSH Binary Packet: length=%d", packet_len)
         else:
             # Show hex dump for binary data
-            hex_str = data[:16].hex()
-            logger.info(f"    Hex Data: {hex_str} ...")
+            logger.info("    Hex Data: %s ...", _LazyHex(data, 16))
             
-    def _is_ssh_binary_packet(self, data: bytes) -> bool:
-        """Check if data looks like SSH binary packet"""
+    def _ssh_binary_length(self, data: bytes) -> int:
+        """SSH packet length if data looks like an SSH binary packet, else 0"""
         if len(data) < 5:
-            return False
-        try:
-            # SSH packets start with 4-byte length field
-            packet_len = struct.unpack('!I', data[:4])[0]
-            # Reasonable SSH packet length (not too small, not too big)
-            return 1 <= packet_len <= 35000 and packet_len <= len(data) + 4
-        except:
-            return False
-            
-    def _get_ssh_packet_length(self, data: bytes) -> int:
-        """Get SSH packet length from header"""
-        try:
-            return struct.unpack('!I', data[:4])[0]
-        except:
             return 0
-            
-    def generate_report(self) -> str:
-        """Generate debugging report"""
-        report = [
-            f"TCP Flow Analysis Report",
-            f"=" * 40,
-            f"Total TCP segments processed: {self.packets_seen}",
-            f"Segments with data: {self.data_packets}",
-            f"SSH data packets: {len(self.ssh_data_packets)}",
-            "",
-        ]
+        packet_len = _SSH_LEN_STRUCT.unpack_from(data)[0]
+        # Reasonable SSH packet length (not too small, not too big); the packet
+        # may continue in later segments, so it need not fit in this one
+        return packet_len if 1 <= packet_len <= 35000 else 0
+    
+    def iter_report_lines(self):
+        """Yield the debugging report line by line"""
+        yield "TCP Flow Analysis Report"
+        yield "=" * 40
+        yield f"Total TCP segments processed: {self.packets_seen}"
+        yield f"Segments with data: {self.data_packets}"
+        yield f"SSH data packets: {self.ssh_data_count}"
+        yield ""
         
         if self.ssh_data_packets:
-            report.append("SSH Data Packet Summary:")
-            for i, pkt in enumerate(self.ssh_data_packets[:10]):  # Show first 10
-                report.append(f"  {i+1}. {pkt['direction']}: {pkt['data_len']} bytes (seq={pkt['seq']})")
-                
-        return "\n".join(report)
+            yield "SSH Data Packet Summary:"
+            for i, (direction, seq, _, data_len) in enumerate(self.ssh_data_packets[:10]):  # Show first 10
+                yield f"  {i+1}. {direction}: {data_len} bytes (seq={seq})"
+    
+    def generate_report(self) -> str:
+        """Generate debugging report"""
+        return "\n".join(self.iter_report_lines())
 
-# Global debugger instance
+# Default debugger, shared unless a task or thread installs its own
 tcp_debugger = TCPFlowDebugger()
 
+# Debugger used by the module-level helpers in the current context
+_debugger_var: "ContextVar[TCPFlowDebugger]" = ContextVar('tcp_debugger', default=tcp_debugger)
+
+def use_debugger(debugger: TCPFlowDebugger):
+    """
+    Route this context's debug_* calls to debugger
+    
+    Call inside a task (or thread) so its segments are tracked separately
+    instead of mutating the shared default. Returns a token for
+    _debugger_var.reset().
+    """
+    return _debugger_var.set(debugger)
+
+def debug_tcp_header(hdr: bytes, data: bytes = b''):
+    """Debug a TCP packet from its raw header bytes - call this from pySLiRP.py"""
+    _debugger_var.get().analyze_tcp_header(hdr, data)
+
+def debug_tcp_batch(records: bytes, payloads: bytes = b''):
+    """Debug a burst of TCP packets packed as _BATCH_REC records plus payloads"""
+    _debugger_var.get().analyze_tcp_batch(records, payloads)
+
 def debug_tcp_packet(packet_info: Dict[str, Any], data: bytes = b''):
-    """Debug a TCP packet - call this from pySLiRP.py"""
-    tcp_debugger.analyze_tcp_segment(packet_info, data)
+    """Debug a TCP packet described by a dict (deprecated, use debug_tcp_header)"""
+    _debugger_var.get().analyze_tcp_segment(packet_info, data)
 
 def debug_report():
-    """Generate and log debugging report"""
-    report = tcp_debugger.generate_report()
-    logger.info(f"\n{report}")
-    return report
\ No newline at end of file
+    """Generate and log debugging report for the current context's debugger"""
+    lines = []
+    for line in _debugger_var.get().iter_report_lines():
+        logger.info("%s", line)
+        lines.append(line)
+    return "\n".join(lines)
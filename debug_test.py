@@ -4,26 +4,67 @@ Simple debug test with logging enabled
 """
 
 import asyncio
+import socket
 import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from safe_logger import setup_safe_logging
 
+class _LineConnection:
+    """Line-oriented client socket on the event loop's sock_* calls"""
+    
+    def __init__(self, buf_size: int = 4096):
+        self._loop = asyncio.get_running_loop()
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._sock.setblocking(False)
+        self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._buf = bytearray(buf_size)  # Reused for every response
+        self._filled = 0
+    
+    async def connect(self, address):
+        await self._loop.sock_connect(self._sock, address)
+    
+    async def send(self, msg: bytes):
+        await self._loop.sock_sendall(self._sock, msg)
+    
+    async def recv_line(self) -> bytes:
+        """Receive until a full line is buffered; returns b'' or a partial line at EOF"""
+        buf = self._buf
+        mv = memoryview(buf)
+        filled = self._filled
+        while True:
+            end = buf.find(b"\n", 0, filled)
+            if end >= 0:
+                line = bytes(mv[:end + 1])
+                self._filled = filled - end - 1
+                mv[:self._filled] = mv[end + 1:filled]
+                return line
+            if filled == len(buf):
+                raise ValueError("line exceeds receive buffer")
+            n = await self._loop.sock_recv_into(self._sock, mv[filled:])
+            if n == 0:
+                self._filled = 0
+                return bytes(mv[:filled])  # EOF
+            filled += n
+    
+    def close(self):
+        self._sock.close()
+
 async def test_connection():
     """Test connection with logging enabled"""
+    conn = _LineConnection()
     try:
         # Connect to PyLiRP forwarder
-        reader, writer = await asyncio.open_connection('127.0.0.1', 8888)
+        await conn.connect(('127.0.0.1', 8888))
         print("✓ Connected to PyLiRP forwarder")
         
         # Send first message
         msg1 = b"Hello PyLiRP\n"
-        writer.write(msg1)
-        await writer.drain()
+        await conn.send(msg1)
         print(f"→ Sent: {msg1.decode().strip()}")
         
-        response1 = await asyncio.wait_for(reader.readline(), timeout=10)
+        response1 = await asyncio.wait_for(conn.recv_line(), timeout=10)
         print(f"← Received: {response1.decode().strip()}")
         
         # Wait a moment
@@ -31,22 +72,21 @@ async def test_connection():
         
         # Send second message  
         msg2 = b"Second message\n"
-        writer.write(msg2)
-        await writer.drain()
+        await conn.send(msg2)
         print(f"→ Sent: {msg2.decode().strip()}")
         
         # This should fail with current bug
-        response2 = await asyncio.wait_for(reader.readline(), timeout=10)
+        response2 = await asyncio.wait_for(conn.recv_line(), timeout=10)
         print(f"← Received: {response2.decode().strip()}")
         
-        writer.close()
-        await writer.wait_closed()
         print("✓ Connection test completed successfully")
         
     except asyncio.TimeoutError:
         print("✗ Timeout waiting for response")
     except Exception as e:
         print(f"✗ Connection error: {e}")
+    finally:
+        conn.close()
 
 if __name__ == "__main__":
     # Enable logging for debug output
@@ -6,19 +6,29 @@ PyLiRP Main Entry Point (Simplified)
 import asyncio
 import sys
 import os
-import platform
 
 # Add current directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from app import PyLiRPApplication
 from cli_utils import (
     create_argument_parser,
     validate_configuration,
     test_serial_port,
     check_virtual_environment,
-    handle_windows_commands
+    handle_windows_commands,
+    IS_WINDOWS,
+    VERSION
 )
+
+# --help/--version exit here, before the application stack is imported;
+# --version does not even need the parser
+if __name__ == '__main__' and sys.argv[1:2] == ['--version']:
+    print(VERSION)
+    sys.exit(0)
+if __name__ == '__main__' and sys.argv[1:2] in (['-h'], ['--help']):
+    create_argument_parser().parse_args()
+
+from app import PyLiRPApplication
 from config_manager import Config, SerialConfig, ProxyConfig
 from safe_logger import setup_safe_logging, get_safe_logger, is_logging_enabled
 
@@ -48,7 +58,7 @@ async def main():
     check_virtual_environment()
     
     # Handle Windows-specific commands
-    if platform.system() == 'Windows':
+    if IS_WINDOWS:
         if await handle_windows_commands(args):
             return
     
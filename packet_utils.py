@@ -0,0 +1,19 @@
+#!/usr/bin/env python3
+"""
+Packet Utilities for PyLiRP
+Checksum helpers shared by the TCP forwarder and proxy implementations
+"""
+
+import sys
+
+def ones_complement_sum(data) -> int:
+    """Folded 16-bit one's complement sum of data in network byte order (RFC 1071)"""
+    if len(data) % 2:
+        data = bytes(data) + b'\x00'
+    # Summing native-order words and swapping the folded result is equivalent
+    total = sum(memoryview(data).cast('H'))
+    while total >> 16:
+        total = (total & 0xFFFF) + (total >> 16)
+    if sys.byteorder == 'little':
+        total = ((total & 0xFF) << 8) | (total >> 8)
+    return total
@@ -37,6 +37,15 @@ class SafeLogger:
             # Silently ignore logging errors to prevent crashes
             pass
     
+    def isEnabledFor(self, level: int) -> bool:
+        """Check whether a message at this level would actually be emitted"""
+        if not self.enabled or not self._logger:
+            return False
+        try:
+            return self._logger.isEnabledFor(level)
+        except Exception:
+            return False
+    
     def debug(self, msg: Any, *args, **kwargs):
         """Log debug message safely"""
         self._safe_log(logging.DEBUG, msg, *args, **kwargs)
@@ -5,17 +5,59 @@ Creates local TCP listeners that forward connections through the PPP link
 """
 
 import asyncio
+import functools
+import logging
 import struct
 import socket
-import random
+import secrets
 import time
 from typing import Dict, Tuple, Optional, Any
 from dataclasses import dataclass, field
 from safe_logger import get_safe_logger
+from packet_utils import ones_complement_sum
+from compat import _SLOTS
 
 logger = get_safe_logger(__name__)
 
-@dataclass
+# Precompiled header layouts; checksums are patched in place with _U16
+_TCP_HDR = struct.Struct('!HHIIBBHHH')
+_IP_HDR = struct.Struct('!BBHHHBBH4s4s')
+_PSEUDO_HDR = struct.Struct('!4s4sBBH')
+_U16 = struct.Struct('!H')
+
+# Client reads take up to _CLIENT_READ_SIZE bytes at once, are coalesced up
+# to _COALESCE_LIMIT bytes (waiting at most _COALESCE_WINDOW seconds for
+# more) and sent as segments of at most _MAX_SEGMENT_DATA bytes with a
+# single serial drain per batch
+_CLIENT_READ_SIZE = 65536
+_COALESCE_LIMIT = 131072
+_COALESCE_WINDOW = 0.001
+_MAX_SEGMENT_DATA = 4096
+
+# PPP address/control/protocol prefix for IPv4 frames
+_PPP_IP_PREFIX = struct.pack('!BBH', 0xFF, 0x03, 0x0021)
+
+async def _close_server(server):
+    """Close a listening server and wait for it to shut down"""
+    server.close()
+    await server.wait_closed()
+
+async def _close_writer(writer):
+    """Close a client stream, ignoring errors from already-dead sockets"""
+    writer.close()
+    try:
+        await writer.wait_closed()
+    except Exception:
+        pass
+
+# Dotted-quad -> packed address; keyed by the string, so a renegotiated
+# bridge address simply misses and is parsed once
+_inet_aton = functools.lru_cache(maxsize=64)(socket.inet_aton)
+
+# AsyncPPPHandler.frame_data, bound on first send (pySLiRP imports this module)
+_frame_data = None
+
+@dataclass(**_SLOTS)
 class ForwardedConnection:
     """Represents a forwarded TCP connection"""
     local_reader: asyncio.StreamReader
@@ -24,7 +66,7 @@ class ForwardedConnection:
     remote_ip: str
     remote_port: int
     synthetic_port: int  # Port we use on PPP side
-    seq_num: int = field(default_factory=lambda: random.randint(1000000, 4000000000))
+    seq_num: int = field(default_factory=lambda: secrets.randbits(32))
     ack_num: int = 0
     state: str = "INIT"
     buffer: bytes = b""
@@ -37,67 +79,92 @@ class TCPPortForwarder:
         self.ppp_bridge = ppp_bridge
         self.listeners = {}
         self.connections = {}  # synthetic_port -> ForwardedConnection
+        self._forwards = {}  # bound local port -> (remote_port, local_bind)
         self.next_synthetic_port = 30000
+        self.ip_id_counter = 0
         self.running = False
         
+        # Scratch buffers reused for payload-less segments and pseudo-headers;
+        # always copied out before the next await, so tasks never share them
+        self._tcp_scratch = bytearray(_TCP_HDR.size)
+        self._pseudo_scratch = bytearray(_PSEUDO_HDR.size)
+        
     def _get_next_synthetic_port(self) -> int:
         """Get next available synthetic port for PPP side"""
-        port = self.next_synthetic_port
-        self.next_synthetic_port += 1
-        if self.next_synthetic_port > 60000:
-            self.next_synthetic_port = 30000
-        return port
+        # Skip ports still held by live connections after the counter wraps
+        for _ in range(60000 - 30000 + 1):
+            port = self.next_synthetic_port
+            self.next_synthetic_port += 1
+            if self.next_synthetic_port > 60000:
+                self.next_synthetic_port = 30000
+            if port not in self.connections:
+                return port
+        raise RuntimeError("No free synthetic ports for forwarded connections")
     
     async def create_listener(self, local_port: int, remote_port: int, 
                             local_bind: str = '127.0.0.1'):
         """Create a local TCP listener that forwards to remote service"""
-        
-        async def handle_client(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
-            """Handle new client connection"""
-            client_addr = writer.get_extra_info('peername')
-            logger.info(f"New connection on {local_bind}:{local_port} from {client_addr}")
-            
-            # Create forwarded connection
-            synthetic_port = self._get_next_synthetic_port()
-            conn = ForwardedConnection(
-                local_reader=reader,
-                local_writer=writer,
-                local_port=local_port,
-                remote_ip=self.ppp_bridge.remote_ip,  # Server IP (10.0.0.1)
-                remote_port=remote_port,
-                synthetic_port=synthetic_port
-            )
-            
-            self.connections[synthetic_port] = conn
-            
-            try:
-                # Initiate TCP connection through PPP
-                await self._send_syn(conn)
-                
-                # Handle bidirectional data forwarding
-                await self._handle_connection(conn)
-                
-            except Exception as e:
-                logger.error(f"Error handling connection: {e}")
-            finally:
-                # Cleanup
-                writer.close()
-                await writer.wait_closed()
-                if synthetic_port in self.connections:
-                    del self.connections[synthetic_port]
-        
-        # Create and start the server
+        # Create the server, register its bound ports, then start accepting
         server = await asyncio.start_server(
-            handle_client, local_bind, local_port
+            self._handle_client, local_bind, local_port, start_serving=False
         )
         
+        for sock in server.sockets:
+            self._forwards[sock.getsockname()[1]] = (remote_port, local_bind)
+        
         self.listeners[local_port] = server
+        await server.start_serving()
         
         addrs = ', '.join(str(sock.getsockname()) for sock in server.sockets)
         logger.info(f"TCP forwarder listening on {addrs} -> {self.ppp_bridge.remote_ip}:{remote_port}")
         
         return server
     
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Handle new client connection on any listener, routed by local port"""
+        local_port = writer.get_extra_info('sockname')[1]
+        remote_port, local_bind = self._forwards[local_port]
+        
+        client_addr = writer.get_extra_info('peername')
+        logger.info(f"New connection on {local_bind}:{local_port} from {client_addr}")
+        
+        # Disable Nagle so small interactive writes aren't held back
+        sock = writer.get_extra_info('socket')
+        if sock is not None:
+            try:
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            except OSError:
+                pass
+        
+        # Create forwarded connection
+        synthetic_port = self._get_next_synthetic_port()
+        conn = ForwardedConnection(
+            local_reader=reader,
+            local_writer=writer,
+            local_port=local_port,
+            remote_ip=self.ppp_bridge.remote_ip,  # Server IP (10.0.0.1)
+            remote_port=remote_port,
+            synthetic_port=synthetic_port
+        )
+        
+        self.connections[synthetic_port] = conn
+        
+        try:
+            # Initiate TCP connection through PPP
+            await self._send_syn(conn)
+            
+            # Handle bidirectional data forwarding
+            await self._handle_connection(conn)
+            
+        except Exception as e:
+            logger.error(f"Error handling connection: {e}")
+        finally:
+            # Cleanup
+            writer.close()
+            await writer.wait_closed()
+            if synthetic_port in self.connections:
+                del self.connections[synthetic_port]
+    
     async def _send_syn(self, conn: ForwardedConnection):
         """Send TCP SYN packet through PPP"""
         logger.info(f"Sending SYN: {conn.synthetic_port} -> {conn.remote_ip}:{conn.remote_port} (seq={conn.seq_num})")
@@ -152,12 +219,14 @@ class TCPPortForwarder:
     
     async def _read_from_client(self, conn: ForwardedConnection):
         """Read data from local client and forward through PPP"""
+        loop = asyncio.get_running_loop()
+        reader = conn.local_reader
         try:
             while conn.state in ["SYN_SENT", "ESTABLISHED"]:
                 # Read from client with timeout
                 try:
                     data = await asyncio.wait_for(
-                        conn.local_reader.read(4096),
+                        reader.read(_CLIENT_READ_SIZE),
                         timeout=1.0
                     )
                 except asyncio.TimeoutError:
@@ -165,49 +234,87 @@ class TCPPortForwarder:
                 
                 if not data:
                     # Client closed connection
-                    logger.debug(f"Client closed connection on port {conn.synthetic_port}")
+                    logger.debug("Client closed connection on port %d", conn.synthetic_port)
                     break
                 
+                # Coalesce whatever else arrives within the window into one batch
+                eof = False
+                if len(data) == _CLIENT_READ_SIZE:
+                    batch = bytearray(data)
+                    deadline = loop.time() + _COALESCE_WINDOW
+                    while len(batch) < _COALESCE_LIMIT:
+                        remaining = deadline - loop.time()
+                        if remaining <= 0:
+                            break
+                        try:
+                            more = await asyncio.wait_for(
+                                reader.read(_COALESCE_LIMIT - len(batch)),
+                                timeout=remaining
+                            )
+                        except asyncio.TimeoutError:
+                            break
+                        if not more:
+                            eof = True
+                            break
+                        batch += more
+                    data = batch
+                
                 # Buffer data if not yet established
                 if conn.state != "ESTABLISHED":
                     conn.buffer += data
                 else:
                     # Send data through PPP
                     await self._send_data(conn, data)
+                
+                if eof:
+                    logger.debug("Client closed connection on port %d", conn.synthetic_port)
+                    break
                     
         except Exception as e:
             logger.error(f"Error reading from client: {e}")
     
     async def _send_data(self, conn: ForwardedConnection, data: bytes):
         """Send data through PPP connection"""
-        logger.debug(f"Sending {len(data)} bytes from local client through PPP for port {conn.synthetic_port}")
-        logger.debug(f"Data packet: seq={conn.seq_num}, ack={conn.ack_num}, data='{data[:20]}'")
-        
-        # Create TCP data packet
-        tcp_segment = self._create_tcp_segment(
-            conn.synthetic_port,
-            conn.remote_port,
-            conn.seq_num,
-            conn.ack_num,
-            flags=0x18,  # PSH|ACK
-            window=8192,
-            data=data
-        )
-        
-        # Send through PPP
-        await self._send_tcp_packet(
-            self.ppp_bridge.local_ip,
-            conn.remote_ip,
-            tcp_segment
-        )
+        logger.debug("Sending %d bytes from local client through PPP for port %d",
+                     len(data), conn.synthetic_port)
+        logger.debug("Data packet: seq=%d, ack=%d, data='%s'",
+                     conn.seq_num, conn.ack_num, data[:20])
+        
+        # Split into segments, writing them all before a single drain
+        view = memoryview(data)
+        for offset in range(0, len(data), _MAX_SEGMENT_DATA):
+            chunk = view[offset:offset + _MAX_SEGMENT_DATA]
+            
+            # Create TCP data packet
+            tcp_segment = self._create_tcp_segment(
+                conn.synthetic_port,
+                conn.remote_port,
+                conn.seq_num,
+                conn.ack_num,
+                flags=0x18,  # PSH|ACK
+                window=8192,
+                data=chunk
+            )
+            
+            # Send through PPP
+            await self._send_tcp_packet(
+                self.ppp_bridge.local_ip,
+                conn.remote_ip,
+                tcp_segment,
+                drain=False
+            )
+            
+            # Update sequence number
+            conn.seq_num = (conn.seq_num + len(chunk)) & 0xFFFFFFFF
         
-        # Update sequence number
-        conn.seq_num += len(data)
-        logger.debug(f"Sent {len(data)} bytes, updated seq to {conn.seq_num}")
+        writer = getattr(self.ppp_bridge, 'serial_writer', None)
+        if writer is not None:
+            await writer.drain()
+        logger.debug("Sent %d bytes, updated seq to %d", len(data), conn.seq_num)
     
     async def _send_fin(self, conn: ForwardedConnection):
         """Send TCP FIN packet"""
-        logger.debug(f"Sending FIN for port {conn.synthetic_port}")
+        logger.debug("Sending FIN for port %d", conn.synthetic_port)
         
         tcp_segment = self._create_tcp_segment(
             conn.synthetic_port,
@@ -229,8 +336,12 @@ class TCPPortForwarder:
     def _create_tcp_segment(self, src_port: int, dst_port: int, seq: int, ack: int,
                            flags: int, window: int, data: bytes = b"") -> bytes:
         """Create a TCP segment"""
-        # TCP header
-        tcp_header = struct.pack('!HHIIBBHHH',
+        # TCP header followed by payload, packed into a single buffer
+        if data:
+            tcp_segment = bytearray(_TCP_HDR.size + len(data))
+        else:
+            tcp_segment = self._tcp_scratch
+        _TCP_HDR.pack_into(tcp_segment, 0,
             src_port,     # Source port
             dst_port,     # Destination port
             seq,          # Sequence number
@@ -241,104 +352,97 @@ class TCPPortForwarder:
             0,            # Checksum (placeholder)
             0             # Urgent pointer
         )
-        
-        tcp_segment = tcp_header + data
+        if data:
+            tcp_segment[_TCP_HDR.size:] = data
         
         # Calculate checksum
-        src_ip = socket.inet_aton(self.ppp_bridge.local_ip)
-        dst_ip = socket.inet_aton(self.ppp_bridge.remote_ip)
+        src_ip = _inet_aton(self.ppp_bridge.local_ip)
+        dst_ip = _inet_aton(self.ppp_bridge.remote_ip)
         checksum = self._calculate_tcp_checksum(src_ip, dst_ip, tcp_segment)
         
         # Update checksum in header
-        tcp_segment = tcp_segment[:16] + struct.pack('!H', checksum) + tcp_segment[18:]
+        _U16.pack_into(tcp_segment, 16, checksum)
         
-        return tcp_segment
+        return bytes(tcp_segment)
     
     def _calculate_tcp_checksum(self, src_ip: bytes, dst_ip: bytes, tcp_segment: bytes) -> int:
         """Calculate TCP checksum including pseudo-header"""
         # Pseudo-header
-        pseudo = struct.pack('!4s4sBBH',
+        pseudo = self._pseudo_scratch
+        _PSEUDO_HDR.pack_into(pseudo, 0,
             src_ip, dst_ip,
             0, 6,  # Reserved, Protocol (TCP)
             len(tcp_segment)
         )
         
-        data = pseudo + tcp_segment
-        if len(data) % 2:
-            data += b'\x00'
-        
-        checksum = 0
-        for i in range(0, len(data), 2):
-            checksum += struct.unpack('!H', data[i:i+2])[0]
-        
-        while checksum >> 16:
-            checksum = (checksum & 0xFFFF) + (checksum >> 16)
+        checksum = ones_complement_sum(pseudo) + ones_complement_sum(tcp_segment)
+        checksum = (checksum & 0xFFFF) + (checksum >> 16)
         
         return ~checksum & 0xFFFF
     
-    async def _send_tcp_packet(self, src_ip: str, dst_ip: str, tcp_segment: bytes):
-        """Send TCP packet through PPP"""
-        # Create IP packet
-        ip_packet = self._create_ip_packet(
-            socket.inet_aton(src_ip),
-            socket.inet_aton(dst_ip),
-            tcp_segment
+    async def _send_tcp_packet(self, src_ip: str, dst_ip: str, tcp_segment: bytes,
+                               drain: bool = True):
+        """Send TCP packet through PPP (drain=False leaves flushing to the caller)"""
+        global _frame_data
+        
+        # Create IP packet directly behind the PPP header in one buffer
+        ppp_frame = self._create_ip_packet(
+            _inet_aton(src_ip),
+            _inet_aton(dst_ip),
+            tcp_segment,
+            headroom=_PPP_IP_PREFIX
         )
         
-        # Create PPP frame
-        ppp_frame = struct.pack('!BBH', 0xFF, 0x03, 0x0021) + ip_packet
-        
         # Frame and send
-        from pySLiRP import AsyncPPPHandler
-        framed = AsyncPPPHandler.frame_data(ppp_frame)
+        if _frame_data is None:
+            from pySLiRP import AsyncPPPHandler
+            _frame_data = AsyncPPPHandler.frame_data
+        framed = _frame_data(ppp_frame)
         
         if hasattr(self.ppp_bridge, 'serial_writer'):
-            logger.debug(f"Sending {len(framed)} bytes through serial: {src_ip}->{dst_ip}")
+            logger.debug("Sending %d bytes through serial: %s->%s", len(framed), src_ip, dst_ip)
             self.ppp_bridge.serial_writer.write(framed)
-            await self.ppp_bridge.serial_writer.drain()
+            if drain:
+                await self.ppp_bridge.serial_writer.drain()
         else:
             logger.error("No serial writer available - packet not sent!")
     
-    def _create_ip_packet(self, src_ip: bytes, dst_ip: bytes, payload: bytes) -> bytes:
-        """Create an IP packet"""
+    def _create_ip_packet(self, src_ip: bytes, dst_ip: bytes, payload: bytes,
+                          headroom: bytes = b"") -> bytes:
+        """Create an IP packet, optionally preceded by headroom (e.g. a PPP header)"""
         # IP header
         version_ihl = (4 << 4) | 5
         tos = 0
         total_length = 20 + len(payload)
-        identification = random.randint(0, 65535)
+        self.ip_id_counter = (self.ip_id_counter + 1) & 0xFFFF
+        identification = self.ip_id_counter
         flags_fragment = 0x4000  # Don't fragment
         ttl = 64
         protocol = 6  # TCP
         checksum = 0
         
-        ip_header = struct.pack('!BBHHHBBH4s4s',
+        offset = len(headroom)
+        packet = bytearray(offset + _IP_HDR.size + len(payload))
+        packet[:offset] = headroom
+        _IP_HDR.pack_into(packet, offset,
             version_ihl, tos, total_length,
             identification, flags_fragment,
             ttl, protocol, checksum,
             src_ip, dst_ip
         )
+        packet[offset + _IP_HDR.size:] = payload
         
         # Calculate checksum
-        checksum = self._calculate_ip_checksum(ip_header)
+        checksum = self._calculate_ip_checksum(bytes(packet[offset:offset + _IP_HDR.size]))
         
         # Update checksum in header
-        ip_header = ip_header[:10] + struct.pack('!H', checksum) + ip_header[12:]
+        _U16.pack_into(packet, offset + 10, checksum)
         
-        return ip_header + payload
+        return bytes(packet)
     
     def _calculate_ip_checksum(self, header: bytes) -> int:
         """Calculate IP header checksum"""
-        if len(header) % 2:
-            header += b'\x00'
-        
-        checksum = 0
-        for i in range(0, len(header), 2):
-            checksum += struct.unpack('!H', header[i:i+2])[0]
-        
-        while checksum >> 16:
-            checksum = (checksum & 0xFFFF) + (checksum >> 16)
-        
-        return ~checksum & 0xFFFF
+        return ~ones_complement_sum(header) & 0xFFFF
     
     async def handle_incoming_packet(self, packet_info: Dict):
         """Handle incoming TCP packet from PPP for our forwarded connections"""
@@ -349,18 +453,19 @@ class TCPPortForwarder:
         ack_num = packet_info.get('ack', 0)
         data = packet_info.get('data', b'')
         
-        # Decode flags for debugging
-        flag_names = []
-        if flags & 0x01: flag_names.append("FIN")
-        if flags & 0x02: flag_names.append("SYN")
-        if flags & 0x04: flag_names.append("RST")
-        if flags & 0x08: flag_names.append("PSH")
-        if flags & 0x10: flag_names.append("ACK")
-        
-        logger.debug(f"Forwarder received: {src_port}->{dst_port}, flags={'/'.join(flag_names) if flag_names else 'NONE'} (0x{flags:02x}), seq={seq_num}, ack={ack_num}, data_len={len(data)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            # Decode flags for debugging
+            flag_names = []
+            if flags & 0x01: flag_names.append("FIN")
+            if flags & 0x02: flag_names.append("SYN")
+            if flags & 0x04: flag_names.append("RST")
+            if flags & 0x08: flag_names.append("PSH")
+            if flags & 0x10: flag_names.append("ACK")
+            
+            logger.debug(f"Forwarder received: {src_port}->{dst_port}, flags={'/'.join(flag_names) if flag_names else 'NONE'} (0x{flags:02x}), seq={seq_num}, ack={ack_num}, data_len={len(data)}")
         
         if dst_port not in self.connections:
-            logger.debug(f"No connection found for port {dst_port}")
+            logger.debug("No connection found for port %s", dst_port)
             return None
         
         conn = self.connections[dst_port]
@@ -385,23 +490,25 @@ class TCPPortForwarder:
             if flags & 0x10:  # ACK flag
                 # Server is acknowledging our sent data
                 server_ack = packet_info.get('ack', 0)
-                logger.debug(f"Server ACKed up to seq {server_ack}, our current seq is {conn.seq_num}")
+                logger.debug("Server ACKed up to seq %d, our current seq is %d", server_ack, conn.seq_num)
                 
                 # CRITICAL: Update our sequence number to match what server ACKed
-                # This ensures we stay in sync with the server's expectations
-                if server_ack > conn.seq_num:
-                    logger.debug(f"Updating seq from {conn.seq_num} to {server_ack} based on server ACK")
+                # This ensures we stay in sync with the server's expectations.
+                # Compare modulo 2^32 (RFC 1982) so an ACK after a sequence
+                # wrap still counts as ahead and a stale one as behind
+                if 0 < ((server_ack - conn.seq_num) & 0xFFFFFFFF) < 0x80000000:
+                    logger.debug("Updating seq from %d to %d based on server ACK", conn.seq_num, server_ack)
                     conn.seq_num = server_ack
             
             # Handle data packets
             data = packet_info.get('data', b'')
             if data:
-                logger.debug(f"Forwarding {len(data)} bytes from server to local client on port {dst_port}")
+                logger.debug("Forwarding %d bytes from server to local client on port %d", len(data), dst_port)
                 # Forward data to local client
                 try:
                     conn.local_writer.write(data)
                     await conn.local_writer.drain()
-                    logger.debug(f"Successfully forwarded {len(data)} bytes to local client")
+                    logger.debug("Successfully forwarded %d bytes to local client", len(data))
                 except Exception as e:
                     logger.error(f"Failed to forward data to local client: {e}")
                 
@@ -413,7 +520,7 @@ class TCPPortForwarder:
             
             # Handle FIN packets
             if flags & 0x01:  # FIN
-                logger.debug(f"Received FIN for port {dst_port}")
+                logger.debug("Received FIN for port %d", dst_port)
                 conn.state = "CLOSE_WAIT"
                 # Send ACK for FIN
                 conn.ack_num = packet_info.get('seq', 0) + 1
@@ -464,13 +571,20 @@ class TCPPortForwarder:
         
         logger.info(f"[FORWARDER] Creating {len(mappings)} port forward listeners...")
         
-        for local_port, remote_port in mappings.items():
-            try:
-                logger.info(f"[FORWARDER] Creating listener on localhost:{local_port} -> {self.ppp_bridge.remote_ip}:{remote_port}")
-                await self.create_listener(local_port, remote_port)
+        # Bring all listeners up concurrently
+        mappings = list(mappings.items())
+        for local_port, remote_port in mappings:
+            logger.info(f"[FORWARDER] Creating listener on localhost:{local_port} -> {self.ppp_bridge.remote_ip}:{remote_port}")
+        results = await asyncio.gather(
+            *(self.create_listener(local_port, remote_port) for local_port, remote_port in mappings),
+            return_exceptions=True
+        )
+        
+        for (local_port, remote_port), result in zip(mappings, results):
+            if isinstance(result, Exception):
+                logger.error(f"[ERROR] Failed to create listener on port {local_port}: {result}")
+            else:
                 logger.info(f"[SUCCESS] Port forward active: localhost:{local_port} -> {self.ppp_bridge.remote_ip}:{remote_port}")
-            except Exception as e:
-                logger.error(f"[ERROR] Failed to create listener on port {local_port}: {e}")
         
         logger.info(f"[FORWARDER] Port forwarder setup complete!")
     
@@ -478,12 +592,10 @@ class TCPPortForwarder:
         """Stop all port forwarders"""
         self.running = False
         
-        # Close all listeners
-        for server in self.listeners.values():
-            server.close()
-            await server.wait_closed()
-        
-        # Close all connections
-        for conn in self.connections.values():
-            conn.local_writer.close()
-            await conn.local_writer.wait_closed()
\ No newline at end of file
+        # Close all listeners and connections concurrently; snapshot the
+        # values since connection handlers remove themselves as they exit
+        await asyncio.gather(
+            *(_close_server(server) for server in list(self.listeners.values())),
+            *(_close_writer(conn.local_writer) for conn in list(self.connections.values())),
+            return_exceptions=True
+        )
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Test that the YAML parse cache sidecar gives back the same configuration
+as a cold parse, including when base and overlay come from mixed cache states
+"""
+
+import sys
+import os
+import tempfile
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from safe_logger import setup_safe_logging
+from config_manager import ConfigManager, _CACHE_SUFFIX
+
+BASE_YAML = """\
+services:
+  22:
+    host: 127.0.0.1
+    port: 22
+    name: SSH
+    max_connections: 10
+  80:
+    host: 127.0.0.1
+    port: 80
+    name: HTTP
+port_forwards:
+  2222: 22
+"""
+
+OVERLAY_YAML = """\
+services:
+  22:
+    max_connections: 5
+  443:
+    host: 127.0.0.1
+    port: 443
+    name: HTTPS
+"""
+
+def _write(path, text):
+    with open(path, 'w') as f:
+        f.write(text)
+
+def _load(base_path, warm):
+    """Load base + 'dev' overlay with only the files in warm having a sidecar"""
+    overlay_path = base_path.replace('.yaml', '.dev.yaml')
+    ConfigManager.clear_parse_cache()
+
+    for path in (base_path, overlay_path):
+        sidecar = path + _CACHE_SUFFIX
+        if os.path.exists(sidecar):
+            os.unlink(sidecar)
+
+    # Warm the requested sidecars, then drop the in-process caches so the
+    # real load has to go through the sidecar for those files
+    for path in warm:
+        ConfigManager()._load_yaml_file(path)
+        assert os.path.exists(path + _CACHE_SUFFIX), f"no sidecar written for {path}"
+    ConfigManager.clear_parse_cache()
+
+    return ConfigManager().load_config(base_path, environment='dev')
+
+def test_mixed_cache_states():
+    print("=== Test: Mixed Cache States Match Cold Load ===")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        base_path = os.path.join(tmp, 'config.yaml')
+        overlay_path = os.path.join(tmp, 'config.dev.yaml')
+        _write(base_path, BASE_YAML)
+        _write(overlay_path, OVERLAY_YAML)
+
+        cold = _load(base_path, warm=())
+        assert sorted(cold.services) == [22, 80, 443], cold.services
+        assert cold.services[22].name == 'SSH'
+        assert cold.services[22].max_connections == 5
+        assert cold.port_forwards == {2222: 22}
+        print("✓ Cold load merged overlay into base services")
+
+        for label, warm in (("base warm", (base_path,)),
+                            ("overlay warm", (overlay_path,)),
+                            ("both warm", (base_path, overlay_path))):
+            config = _load(base_path, warm=warm)
+            assert config.services == cold.services, f"{label}: {config.services}"
+            assert config.port_forwards == cold.port_forwards, label
+            print(f"✓ {label} matches cold load")
+
+        ConfigManager.clear_parse_cache()
+
+def test_binary_cache_opt_out():
+    print("\n=== Test: use_binary_cache=False Skips the Sidecar ===")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        base_path = os.path.join(tmp, 'config.yaml')
+        _write(base_path, BASE_YAML)
+        ConfigManager.clear_parse_cache()
+
+        config = ConfigManager(use_binary_cache=False).load_config(base_path)
+        assert sorted(config.services) == [22, 80], config.services
+        assert not os.path.exists(base_path + _CACHE_SUFFIX)
+        print("✓ No sidecar written with the binary cache turned off")
+
+        ConfigManager.clear_parse_cache()
+
+if __name__ == "__main__":
+    setup_safe_logging(enabled=False)
+    test_mixed_cache_states()
+    test_binary_cache_opt_out()
+    print("\n🎉 Config cache tests completed!")